@@ -5,11 +5,48 @@ This module creates and configures a Letta sleep-time agent focused on research
 """
 
 import os
+import sys
 import json
+import logging
+import functools
 from typing import Optional
 from dotenv import load_dotenv
 from letta_client import Letta, SleeptimeManagerUpdate
 
+# orjson is an optional speedup; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Load .env once per process rather than on every agent creation
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time it is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_ensure_env()
+
+
+@functools.lru_cache(maxsize=1)
+def _letta_token() -> Optional[str]:
+    """Return the Letta API token from the environment, read once."""
+    return os.getenv("LETTA_API_TOKEN")
+
+
+@functools.lru_cache(maxsize=4)
+def _get_letta_client(token: str) -> Letta:
+    """Return a Letta client for the token, reusing its connection pool across calls."""
+    return Letta(token=token, timeout=60.0)
+
 
 def create_sleep_research_agent() -> dict:
     """
@@ -23,19 +60,16 @@ def create_sleep_research_agent() -> dict:
         Exception: If agent creation fails
     """
     # Load environment variables
-    load_dotenv()
+    _ensure_env()
     
     # Retrieve API Token
-    api_token = os.getenv("LETTA_API_TOKEN")
+    api_token = _letta_token()
     if not api_token:
         raise ValueError("LETTA_API_TOKEN not found in environment variables")
     
     try:
-        # Initialize Letta client with timeout
-        client = Letta(
-            token=api_token,
-            timeout=60.0
-        )
+        # Initialize (or reuse) Letta client with timeout
+        client = _get_letta_client(api_token)
         
         # Create the sleep-time enabled agent with research focus
         agent = client.agents.create(
@@ -57,7 +91,7 @@ def create_sleep_research_agent() -> dict:
             enable_sleeptime=True  # Enable sleep-time agent
         )
         
-        print(f"Successfully created sleep-time research agent with ID: {agent.id}")
+        logger.info("Successfully created sleep-time research agent with ID: %s", agent.id)
         
         # Get the multi-agent group information
         group_id = None
@@ -66,14 +100,14 @@ def create_sleep_research_agent() -> dict:
         try:
             group_id = agent.multi_agent_group.id
             current_frequency = agent.multi_agent_group.sleep_time_agent_frequency
-            print(f"Group ID: {group_id}")
-            print(f"Current sleep-time frequency: {current_frequency}")
+            logger.info("Group ID: %s", group_id)
+            logger.info("Current sleep-time frequency: %s", current_frequency)
         except AttributeError as e:
-            print(f"Warning: Could not access group information: {str(e)}")
+            logger.warning("Warning: Could not access group information: %s", e)
             # Try to get group_id from a different path if available
             if hasattr(agent, 'multi_agent_group') and hasattr(agent.multi_agent_group, 'id'):
                 group_id = agent.multi_agent_group.id
-                print(f"Group ID: {group_id}")
+                logger.info("Group ID: %s", group_id)
             
             # Check if we can get frequency from group directly
             if group_id:
@@ -81,13 +115,13 @@ def create_sleep_research_agent() -> dict:
                     group_info = client.groups.retrieve(group_id=group_id)
                     if hasattr(group_info, 'sleeptime_agent_frequency'):
                         current_frequency = group_info.sleeptime_agent_frequency
-                        print(f"Current sleep-time frequency: {current_frequency}")
+                        logger.info("Current sleep-time frequency: %s", current_frequency)
                 except Exception as group_e:
-                    print(f"Could not retrieve group info: {str(group_e)}")
+                    logger.warning("Could not retrieve group info: %s", group_e)
         
         # Update frequency to 2 if it's not already set to 2
         if group_id and current_frequency is not None and current_frequency != 2:
-            print("Updating sleep-time agent frequency to 2...")
+            logger.info("Updating sleep-time agent frequency to 2...")
             try:
                 group = client.groups.modify(
                     group_id=group_id,
@@ -95,10 +129,10 @@ def create_sleep_research_agent() -> dict:
                         sleep_time_agent_frequency=2
                     )
                 )
-                print("Sleep-time frequency updated to 2")
+                logger.info("Sleep-time frequency updated to 2")
             except Exception as e:
-                print(f"Warning: Could not update frequency: {str(e)}")
-                print("Continuing with default frequency...")
+                logger.warning("Warning: Could not update frequency: %s", e)
+                logger.warning("Continuing with default frequency...")
         
         return {
             "agent_id": agent.id, 
@@ -108,17 +142,22 @@ def create_sleep_research_agent() -> dict:
         }
         
     except Exception as e:
-        print(f"Error creating sleep-time agent: {str(e)}")
+        logger.error("Error creating sleep-time agent: %s", e)
         raise
 
 
-def save_agent_config(agent_info: dict, file_path: str = "agent_config.json") -> None:
+def save_agent_config(
+    agent_info: dict, 
+    file_path: str = "agent_config.json", 
+    pretty: bool = False
+) -> None:
     """
     Save agent configuration to a JSON file.
     
     Args:
         agent_info (dict): The agent information including agent_id and group_id
         file_path (str): Path to save the configuration file
+        pretty (bool): Write indented JSON instead of compact JSON
         
     Raises:
         Exception: If file writing fails
@@ -131,31 +170,42 @@ def save_agent_config(agent_info: dict, file_path: str = "agent_config.json") ->
             "sleep_time_frequency": agent_info.get("sleep_time_frequency", 2)
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(config_data, f, indent=4)
+        # Compact output by default; indenting forces json's pure-Python encoder
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            blob = orjson.dumps(config_data, option=option)
+        elif pretty:
+            blob = json.dumps(config_data, indent=4).encode('utf-8')
+        else:
+            blob = json.dumps(config_data, separators=(',', ':')).encode('utf-8')
+        
+        # Serialize once to bytes and write in binary mode, skipping the text encoder
+        with open(file_path, 'wb') as f:
+            f.write(blob)
             
-        print(f"Sleep-time agent configuration saved to {file_path}")
+        logger.info("Sleep-time agent configuration saved to %s", file_path)
         
     except Exception as e:
-        print(f"Error saving agent configuration: {str(e)}")
+        logger.error("Error saving agent configuration: %s", e)
         raise
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     try:
-        print("Creating sleep-time research agent...")
+        logger.info("Creating sleep-time research agent...")
         agent_info = create_sleep_research_agent()
         
         if agent_info and "agent_id" in agent_info:
-            save_agent_config(agent_info)
-            print(f"Sleep-time research agent created successfully!")
-            print(f"Agent ID: {agent_info['agent_id']}")
-            print(f"Group ID: {agent_info.get('group_id', 'N/A')}")
-            print(f"Sleep-time frequency: {agent_info.get('sleep_time_frequency', 2)}")
-            print("Configuration saved to agent_config.json")
+            save_agent_config(agent_info, pretty="--pretty" in sys.argv)
+            logger.info("Sleep-time research agent created successfully!")
+            logger.info("Agent ID: %s", agent_info['agent_id'])
+            logger.info("Group ID: %s", agent_info.get('group_id', 'N/A'))
+            logger.info("Sleep-time frequency: %s", agent_info.get('sleep_time_frequency', 2))
+            logger.info("Configuration saved to agent_config.json")
         else:
-            print("Failed to create agent - no agent ID returned")
+            logger.error("Failed to create agent - no agent ID returned")
             
     except Exception as e:
-        print(f"Failed to create sleep-time research agent: {str(e)}")
+        logger.error("Failed to create sleep-time research agent: %s", e)
         exit(1)
\ No newline at end of file
@@ -7,15 +7,19 @@ Enhanced with rich formatting for beautiful terminal output.
 """
 
 import os
+import re
 import json
 import time
+import functools
+import queue
+import threading
 import sys
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dotenv import load_dotenv
-from letta_client import Letta
-from mongodb_memory import MongoDBMemory
+from mongodb_memory import get_mongo_memory
 from research_tools import TavilySearchTool
-from memory_sync import sync_sleep_memories
+from memory_sync import sync_sleep_memories, _get_letta_client
 
 # Rich imports for beautiful CLI
 from rich.console import Console
@@ -24,14 +28,116 @@ from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 from rich.prompt import Prompt
-from rich.markdown import Markdown
 from rich import box
-from rich.columns import Columns
-from rich.align import Align
+
+# orjson is an optional speedup; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Load .env once per process rather than on every session start
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time it is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_ensure_env()
+
+
+@functools.lru_cache(maxsize=1)
+def _letta_token() -> Optional[str]:
+    """Return the Letta API token from the environment, read once."""
+    return os.getenv("LETTA_API_TOKEN")
+
 
 # Initialize rich console
 console = Console()
 
+# Invariant panels, built once and reused on every print
+_HELP_PANEL = Panel(
+    """
+[bold cyan]💬 Available Commands:[/bold cyan]
+  [yellow]help[/yellow]          - Show this help message
+  [yellow]stats[/yellow]         - Show session statistics
+  [yellow]sync[/yellow]          - Synchronize sleep agent memories
+  [yellow]clear[/yellow]         - Clear screen
+  [yellow]quit[/yellow] or [yellow]exit[/yellow]  - Exit the application
+
+[bold cyan]🌟 Features:[/bold cyan]
+  • [green]Memory-enhanced responses[/green] using MongoDB
+  • [green]Automatic web search[/green] for current information
+  • [green]Sleep agent[/green] with background memory processing
+  • [green]Session statistics[/green] and memory tracking
+  • [green]Persistent conversation history[/green]
+  • [green]Beautiful terminal interface[/green] with rich formatting
+    """,
+    title="[bold blue]🆘 Tool Memory CLI Help",
+    border_style="blue",
+    box=box.ROUNDED
+)
+
+_SYNC_PANEL = Panel(
+    Text("🔄 Synchronizing sleep agent memories...", style="bold yellow"),
+    border_style="yellow",
+    box=box.MINIMAL
+)
+
+_WELCOME_PANEL = Panel(
+    Text("🎯 Welcome to the Tool Memory CLI with Sleep Agent!\n💡 Enhanced with persistent memory and web search capabilities\n📝 Your conversations are automatically saved and enhanced", 
+         style="bold green", justify="center"),
+    title="[bold blue]Tool Memory System",
+    subtitle="[dim]Powered by Letta Sleep Agent + MongoDB + Tavily[/dim]",
+    border_style="blue",
+    box=box.DOUBLE
+)
+
+_GOODBYE_PANEL = Panel(
+    Text("👋 Goodbye! Thanks for using Tool Memory CLI!", style="bold yellow", justify="center"),
+    border_style="yellow",
+    box=box.ROUNDED
+)
+
+_FINAL_SUMMARY_PANEL = Panel(
+    Text("📊 Final Session Summary", style="bold magenta", justify="center"),
+    border_style="magenta",
+    box=box.MINIMAL
+)
+
+_FINAL_GOODBYE_PANEL = Panel(
+    Text("🙏 Thank you for using Tool Memory CLI with Sleep Agent!\n✨ Your memories have been preserved for future sessions", 
+         style="bold blue", justify="center"),
+    border_style="blue",
+    box=box.DOUBLE
+)
+
+@functools.lru_cache(maxsize=8)
+def _load_agent_config_cached(file_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Read and parse an agent configuration file.
+    
+    Cached on (file_path, mtime_ns) so an unchanged file is parsed only once,
+    while edits to the file invalidate the cached entry.
+    
+    Args:
+        file_path (str): Path to the agent configuration file.
+        mtime_ns (int): Modification time of the file, used as part of the cache key.
+        
+    Returns:
+        Dict[str, Any]: Parsed agent configuration.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def load_agent_config(file_path: str = "agent_config.json") -> Optional[Dict[str, Any]]:
     """
     Load agent configuration from configuration file.
@@ -43,9 +149,10 @@ def load_agent_config(file_path: str = "agent_config.json") -> Optional[Dict[str
         Optional[Dict[str, Any]]: Agent configuration if found, None otherwise.
     """
     try:
-        with open(file_path, 'r') as f:
-            config = json.load(f)
-            return config
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        # Copy so callers can't mutate the cached dict
+        config = dict(_load_agent_config_cached(file_path, mtime_ns))
+        return config
     except FileNotFoundError:
         console.print(f"[red]❌ Error: Agent config file '{file_path}' not found.[/red]")
         return None
@@ -60,6 +167,15 @@ class SleepChatSession:
     with memory enhancement and web search capabilities. Features beautiful rich formatting.
     """
     
+    # Web search trigger words, matched against the query's word tokens
+    _TRIGGERS_HIT = frozenset({'latest', 'recent', 'current', 'today', 'news', '2024', '2025'})
+    _TRIGGERS_MISS = _TRIGGERS_HIT | frozenset({'when', 'where', 'who'})
+    # Multi-word triggers, only checked when the single-word check fails
+    _TRIGGER_PHRASES_MISS_RE = re.compile(r'\b(?:what is|how to)\b')
+    _TOKEN_RE = re.compile(r'\w+')
+    
+    _EXIT_COMMANDS = frozenset({'quit', 'exit'})
+    
     def __init__(self):
         """
         Initialize the SleepChatSession with enhanced visual feedback.
@@ -74,6 +190,23 @@ class SleepChatSession:
         self.memory_hits = 0
         self.web_searches = 0
         
+        # CLI command dispatch table
+        self._commands = {
+            'help': self.show_help,
+            'stats': self.show_session_stats,
+            'sync': self.sync_sleep_memories,
+            'clear': console.clear,
+        }
+        
+        # Reusable query header panel; the text buffer is refilled per query
+        self._query_text = Text()
+        self._query_panel = Panel(
+            self._query_text,
+            title="[bold yellow]🤔 Processing Query",
+            border_style="yellow",
+            box=box.MINIMAL
+        )
+        
         # Show initialization progress
         with Progress(
             SpinnerColumn(),
@@ -85,9 +218,8 @@ class SleepChatSession:
             # Initialize MongoDB memory
             task1 = progress.add_task("[cyan]Connecting to MongoDB memory system...", total=None)
             try:
-                self.mongo_memory = MongoDBMemory()
+                self.mongo_memory = get_mongo_memory()
                 progress.update(task1, description="[green]✅ MongoDB memory system connected")
-                time.sleep(0.5)  # Brief pause for visual effect
             except Exception as e:
                 progress.update(task1, description=f"[red]❌ Failed to initialize MongoDB memory: {str(e)}")
                 raise
@@ -97,7 +229,6 @@ class SleepChatSession:
             try:
                 self.tavily_search = TavilySearchTool()
                 progress.update(task2, description="[green]✅ Tavily search tool initialized")
-                time.sleep(0.5)
             except Exception as e:
                 progress.update(task2, description=f"[red]❌ Failed to initialize Tavily search: {str(e)}")
                 raise
@@ -118,27 +249,38 @@ class SleepChatSession:
                 raise ValueError("Agent ID not found in configuration")
             
             progress.update(task3, description="[green]✅ Sleep agent configuration loaded")
-            time.sleep(0.5)
             
             # Initialize Letta client with sleep agent
             task4 = progress.add_task("[cyan]Connecting to Letta sleep agent...", total=None)
             try:
-                letta_api_token = os.getenv("LETTA_API_TOKEN")
+                letta_api_token = _letta_token()
                 if not letta_api_token:
                     progress.update(task4, description="[red]❌ LETTA_API_TOKEN not found in environment variables")
                     raise ValueError("LETTA_API_TOKEN not found in environment variables")
                 
-                self.letta_client = Letta(
-                    token=letta_api_token,
-                    timeout=60.0
-                )
+                self.letta_client = _get_letta_client(letta_api_token)
                 progress.update(task4, description=f"[green]✅ Letta sleep agent connected: {self.agent_type}")
-                time.sleep(0.5)
                 
             except Exception as e:
                 progress.update(task4, description=f"[red]❌ Failed to connect to Letta sleep agent: {str(e)}")
                 raise
         
+        # Metadata templates for stored memories; filled per use and copied on enqueue
+        self._meta_web = {"source": "tavily_web_search"}
+        self._meta_interact = {
+            "source": "sleep_agent_interaction",
+            "agent_id": self.agent_id,
+            "group_id": self.group_id
+        }
+        
+        # Worker pool for overlapping memory search with speculative web search
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        
+        # Memory writes are queued and flushed in batches off the critical path
+        self._write_q = queue.Queue()
+        self._writer = threading.Thread(target=self._drain_writes, daemon=True)
+        self._writer.start()
+        
         # Show success message
         success_panel = Panel(
             Text("🎯 Enhanced Sleep Agent Ready for Interaction!\n💡 Type 'help' to see available commands", style="bold green"),
@@ -153,50 +295,117 @@ class SleepChatSession:
             console.print(f"[dim]📝 Sleep agent group ID: {self.group_id}[/dim]")
         console.print("\n")
     
-    def search_web_if_needed(self, query: str, memory_results: List[Dict]) -> Optional[str]:
+    def _drain_writes(self, max_batch: int = 32, max_wait: float = 0.2):
         """
-        Determine if a web search is needed and perform it if necessary.
+        Background writer loop that flushes queued memories to MongoDB in batches.
+        
+        Args:
+            max_batch (int): Maximum number of memories per bulk insert.
+            max_wait (float): Seconds to wait for more items after the first arrives.
+        """
+        while True:
+            batch = [self._write_q.get()]
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self.mongo_memory.add_memories_bulk(batch)
+            except Exception as e:
+                console.print(f"[yellow]⚠️ Failed to store {len(batch)} memories: {str(e)}[/yellow]")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+    
+    def _query_tokens(self, query: str) -> Tuple[str, Set[str]]:
+        """
+        Lowercase a query and split it into word tokens for trigger matching.
         
         Args:
             query (str): User's query.
-            memory_results (List[Dict]): Results from memory search.
             
         Returns:
-            Optional[str]: Web search results if performed, None otherwise.
+            Tuple[str, Set[str]]: The lowercased query and its word tokens.
+        """
+        # casefold() is only needed to normalize non-ASCII text
+        query_lower = query.lower() if query.isascii() else query.casefold()
+        return query_lower, set(self._TOKEN_RE.findall(query_lower))
+    
+    def needs_web_search(self, query: str, memory_results: Optional[List[Dict]]) -> bool:
         """
+        Decide whether a query should trigger a web search.
+        
+        Args:
+            query (str): User's query.
+            memory_results (Optional[List[Dict]]): Results from memory search.
+            
+        Returns:
+            bool: True if a web search should be performed.
+        """
+        query_lower, tokens = self._query_tokens(query)
+        
         # Check if we have relevant memory results
         if memory_results and len(memory_results) > 0:
             # If we have good memory results, less likely to need web search
-            web_trigger_words = ['latest', 'recent', 'current', 'today', 'news', '2024', '2025']
-        else:
-            # If no memory results, lower threshold for web search
-            web_trigger_words = ['latest', 'recent', 'current', 'today', 'news', '2024', '2025', 
-                               'what is', 'how to', 'when', 'where', 'who']
+            return not tokens.isdisjoint(self._TRIGGERS_HIT)
         
-        query_lower = query.lower()
-        needs_web_search = any(trigger in query_lower for trigger in web_trigger_words)
+        # If no memory results, lower threshold for web search
+        return (
+            not tokens.isdisjoint(self._TRIGGERS_MISS)
+            or self._TRIGGER_PHRASES_MISS_RE.search(query_lower) is not None
+        )
+    
+    def search_web_if_needed(
+        self, 
+        query: str, 
+        memory_results: List[Dict], 
+        pending_search: Optional[Future] = None
+    ) -> Optional[str]:
+        """
+        Determine if a web search is needed and perform it if necessary.
         
-        if needs_web_search:
-            try:
-                with console.status("[cyan]🔍 Searching the web for current information...", spinner="dots"):
+        Args:
+            query (str): User's query.
+            memory_results (List[Dict]): Results from memory search.
+            pending_search (Optional[Future]): Speculative search already in flight, if any.
+                Only started for queries that search the web whatever memory returns;
+                a running search cannot be cancelled, so it is never discarded.
+            
+        Returns:
+            Optional[str]: Web search results if performed, None otherwise.
+        """
+        needs_web_search = pending_search is not None or self.needs_web_search(query, memory_results)
+        
+        if not needs_web_search:
+            return None
+        
+        try:
+            with console.status("[cyan]🔍 Searching the web for current information...", spinner="dots"):
+                if pending_search is not None:
+                    search_results = pending_search.result()
+                else:
                     search_results = self.tavily_search.search(query)
-                    self.web_searches += 1
+                self.web_searches += 1
+            
+            if search_results:
+                console.print("[green]✅ Web search completed[/green]")
+                # Store web search results in memory for future use
+                search_summary = f"Web search results for '{query}': {search_results[:500]}..."
+                metadata = self._meta_web
+                metadata["query"] = query
+                metadata["search_timestamp"] = time.time()
+                self._write_q.put((search_summary, metadata.copy()))
                 
-                if search_results:
-                    console.print("[green]✅ Web search completed[/green]")
-                    # Store web search results in memory for future use
-                    search_summary = f"Web search results for '{query}': {search_results[:500]}..."
-                    metadata = {
-                        "source": "tavily_web_search",
-                        "query": query,
-                        "search_timestamp": time.time()
-                    }
-                    self.mongo_memory.add_memory(search_summary, metadata=metadata)
-                    
-                    return search_results
-                    
-            except Exception as e:
-                console.print(f"[yellow]⚠️ Web search failed: {str(e)}[/yellow]")
+                return search_results
+                
+        except Exception as e:
+            console.print(f"[yellow]⚠️ Web search failed: {str(e)}[/yellow]")
         
         return None
     
@@ -211,20 +420,28 @@ class SleepChatSession:
             str: The agent's response.
         """
         # Show query processing header
-        query_panel = Panel(
-            Text(user_query, style="bold cyan"),
-            title="[bold yellow]🤔 Processing Query",
-            border_style="yellow",
-            box=box.MINIMAL
-        )
-        console.print(query_panel)
+        self._query_text.plain = ""
+        self._query_text.append(user_query, style="bold cyan")
+        console.print(self._query_panel)
         
         self.queries_processed += 1
         
         try:
-            # Search relevant memories with progress indicator
+            # Search relevant memories, starting the web search in parallel only
+            # when memory results cannot change the decision: time-sensitive
+            # triggers search the web even with memory hits. Other triggers wait
+            # for the memory search, since a started search cannot be cancelled.
+            memory_future = self._pool.submit(self.mongo_memory.search_memories, user_query, 5)
+            web_future = None
+            if not self._query_tokens(user_query)[1].isdisjoint(self._TRIGGERS_HIT):
+                web_future = self._pool.submit(self.tavily_search.search, user_query)
+            
             with console.status("[cyan]🧠 Searching memory database...", spinner="dots"):
-                memory_results = self.mongo_memory.search_memories(user_query, limit=5)
+                try:
+                    memory_results = memory_future.result()
+                except Exception as e:
+                    console.print(f"[yellow]⚠️ Memory search unavailable: {str(e)}[/yellow]")
+                    memory_results = []
             
             if memory_results:
                 self.memory_hits += 1
@@ -233,21 +450,26 @@ class SleepChatSession:
                 console.print("[dim]📭 No relevant memories found[/dim]")
             
             # Check if web search is needed
-            web_results = self.search_web_if_needed(user_query, memory_results)
+            web_results = self.search_web_if_needed(user_query, memory_results, web_future)
             
-            # Construct enhanced prompt with context
-            enhanced_prompt = f"User query: {user_query}\n\n"
+            # Construct enhanced prompt with context in a single join
+            prompt_parts = [f"User query: {user_query}\n\n"]
             
             if memory_results:
-                enhanced_prompt += "Relevant memories:\n"
-                for i, memory in enumerate(memory_results[:3], 1):
-                    enhanced_prompt += f"{i}. {memory.get('text', '')[:200]}...\n"
-                enhanced_prompt += "\n"
+                memory_lines = ["Relevant memories:"]
+                memory_lines.extend(
+                    f"{i}. {(memory.get('text') or '')[:200]}..."
+                    for i, memory in enumerate(memory_results[:3], 1)
+                )
+                prompt_parts.append("\n".join(memory_lines))
+                prompt_parts.append("\n\n")
             
             if web_results:
-                enhanced_prompt += f"Current web information:\n{web_results[:800]}\n\n"
+                web_text = web_results if len(web_results) <= 800 else web_results[:800]
+                prompt_parts.append(f"Current web information:\n{web_text}\n\n")
             
-            enhanced_prompt += "Please provide a comprehensive response using the available context."
+            prompt_parts.append("Please provide a comprehensive response using the available context.")
+            enhanced_prompt = "".join(prompt_parts)
             
             # Send to Letta sleep agent with progress indicator
             with console.status("[cyan]🤖 Getting response from sleep agent...", spinner="dots"):
@@ -257,25 +479,23 @@ class SleepChatSession:
                 )
             
             # Extract response text
-            if hasattr(response, 'messages') and response.messages:
-                agent_response = ""
-                for msg in response.messages:
-                    if hasattr(msg, 'text') and msg.text:
-                        agent_response += msg.text + " "
+            try:
+                messages = response.messages or ()
+            except AttributeError:
+                messages = ()
+            
+            parts = [msg.text for msg in messages if getattr(msg, 'text', None)]
+            agent_response = " ".join(parts)
+            
+            if agent_response:
+                # Store the interaction in memory
+                interaction_text = f"Q: {user_query}\nA: {agent_response}"
+                metadata = self._meta_interact
+                metadata["query"] = user_query
+                metadata["timestamp"] = time.time()
+                self._write_q.put((interaction_text, metadata.copy()))
                 
-                if agent_response.strip():
-                    # Store the interaction in memory
-                    interaction_text = f"Q: {user_query}\nA: {agent_response.strip()}"
-                    metadata = {
-                        "source": "sleep_agent_interaction",
-                        "agent_id": self.agent_id,
-                        "group_id": self.group_id,
-                        "query": user_query,
-                        "timestamp": time.time()
-                    }
-                    self.mongo_memory.add_memory(interaction_text, metadata=metadata)
-                    
-                    return agent_response.strip()
+                return agent_response
             
             return "I apologize, but I couldn't generate a response. Please try again."
             
@@ -326,42 +546,13 @@ class SleepChatSession:
     
     def show_help(self):
         """Display help information in a beautiful formatted panel."""
-        help_content = """
-[bold cyan]💬 Available Commands:[/bold cyan]
-  [yellow]help[/yellow]          - Show this help message
-  [yellow]stats[/yellow]         - Show session statistics
-  [yellow]sync[/yellow]          - Synchronize sleep agent memories
-  [yellow]clear[/yellow]         - Clear screen
-  [yellow]quit[/yellow] or [yellow]exit[/yellow]  - Exit the application
-
-[bold cyan]🌟 Features:[/bold cyan]
-  • [green]Memory-enhanced responses[/green] using MongoDB
-  • [green]Automatic web search[/green] for current information
-  • [green]Sleep agent[/green] with background memory processing
-  • [green]Session statistics[/green] and memory tracking
-  • [green]Persistent conversation history[/green]
-  • [green]Beautiful terminal interface[/green] with rich formatting
-        """
-        
-        help_panel = Panel(
-            help_content,
-            title="[bold blue]🆘 Tool Memory CLI Help",
-            border_style="blue",
-            box=box.ROUNDED
-        )
-        
         console.print("\n")
-        console.print(help_panel)
+        console.print(_HELP_PANEL)
     
     def sync_sleep_memories(self):
         """Synchronize sleep agent memories with MongoDB."""
-        sync_panel = Panel(
-            Text("🔄 Synchronizing sleep agent memories...", style="bold yellow"),
-            border_style="yellow",
-            box=box.MINIMAL
-        )
         console.print("\n")
-        console.print(sync_panel)
+        console.print(_SYNC_PANEL)
         
         try:
             with console.status("[cyan]Synchronizing memories...", spinner="dots"):
@@ -377,15 +568,7 @@ class SleepChatSession:
     def run_cli(self):
         """Main CLI interaction loop with beautiful formatting."""
         # Welcome message
-        welcome_panel = Panel(
-            Text("🎯 Welcome to the Tool Memory CLI with Sleep Agent!\n💡 Enhanced with persistent memory and web search capabilities\n📝 Your conversations are automatically saved and enhanced", 
-                 style="bold green", justify="center"),
-            title="[bold blue]Tool Memory System",
-            subtitle="[dim]Powered by Letta Sleep Agent + MongoDB + Tavily[/dim]",
-            border_style="blue",
-            box=box.DOUBLE
-        )
-        console.print(welcome_panel)
+        console.print(_WELCOME_PANEL)
         console.print("\n")
         
         while True:
@@ -397,25 +580,20 @@ class SleepChatSession:
                     continue
                 
                 # Handle commands
-                if user_input.lower() in ['quit', 'exit']:
+                command = user_input.lower()
+                if command in self._EXIT_COMMANDS:
                     break
-                elif user_input.lower() == 'help':
-                    self.show_help()
-                    continue
-                elif user_input.lower() == 'stats':
-                    self.show_session_stats()
-                    continue
-                elif user_input.lower() == 'sync':
-                    self.sync_sleep_memories()
-                    continue
-                elif user_input.lower() == 'clear':
-                    console.clear()
+                handler = self._commands.get(command)
+                if handler is not None:
+                    handler()
                     continue
                 
                 # Process the query
                 response = self.process_query(user_input)
                 
-                # Display response in a beautiful panel
+                # Display response in a beautiful panel; Markdown is imported
+                # lazily since it pulls in markdown-it and pygments
+                from rich.markdown import Markdown
                 response_panel = Panel(
                     Markdown(response),
                     title="[bold green]🤖 Sleep Agent Response",
@@ -428,12 +606,7 @@ class SleepChatSession:
                 
             except KeyboardInterrupt:
                 console.print("\n")
-                goodbye_panel = Panel(
-                    Text("👋 Goodbye! Thanks for using Tool Memory CLI!", style="bold yellow", justify="center"),
-                    border_style="yellow",
-                    box=box.ROUNDED
-                )
-                console.print(goodbye_panel)
+                console.print(_GOODBYE_PANEL)
                 break
             except Exception as e:
                 console.print(f"\n[red]❌ Unexpected error: {str(e)}[/red]")
@@ -441,30 +614,21 @@ class SleepChatSession:
         
         # Final statistics
         console.print("\n")
-        final_panel = Panel(
-            Text("📊 Final Session Summary", style="bold magenta", justify="center"),
-            border_style="magenta",
-            box=box.MINIMAL
-        )
-        console.print(final_panel)
+        console.print(_FINAL_SUMMARY_PANEL)
         self.show_session_stats()
         
         # Clean up
         try:
-            self.mongo_memory.close()
-            console.print("\n[green]✅ MongoDB connection closed[/green]")
+            self._pool.shutdown(wait=False)
+            self._write_q.join()  # Flush pending memory writes
+            # The shared MongoDB connection is closed at process exit
+            console.print("\n[green]✅ Pending memories saved to MongoDB[/green]")
         except:
             pass
         
         # Final goodbye
-        final_goodbye = Panel(
-            Text("🙏 Thank you for using Tool Memory CLI with Sleep Agent!\n✨ Your memories have been preserved for future sessions", 
-                 style="bold blue", justify="center"),
-            border_style="blue",
-            box=box.DOUBLE
-        )
         console.print("\n")
-        console.print(final_goodbye)
+        console.print(_FINAL_GOODBYE_PANEL)
 
 
 def main():
@@ -472,7 +636,7 @@ def main():
     Main entry point for the enhanced CLI application.
     """
     # Load environment variables
-    load_dotenv()
+    _ensure_env()
     
     try:
         session = SleepChatSession()
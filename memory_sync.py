@@ -6,12 +6,84 @@ for enhanced memory capabilities.
 """
 
 import os
+import sys
 import json
 import time
-from typing import Dict, List, Optional, Any
+import logging
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 from letta_client import Letta
-from mongodb_memory import MongoDBMemory
+from mongodb_memory import get_mongo_memory
+
+# orjson is an optional speedup; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Load .env once per process rather than on every synchronizer creation
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time it is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+# Per-record sync details are logged at DEBUG; summaries are still printed
+logger = logging.getLogger(__name__)
+
+# Metadata values shared by every synced memory; interned so all records
+# reference the same string objects
+SRC_CORE = sys.intern("letta_sleep_core_memory")
+SRC_CHAT = sys.intern("letta_sleep_chat_history")
+SRC_STATE = sys.intern("letta_sleep_agent_state")
+AGENT_TYPE_SLEEP = sys.intern("sleep_agent")
+
+# Sources deduplicated by content hash; chat history is incremental by cursor
+DEDUPED_SOURCES = (SRC_CORE, SRC_STATE)
+
+# Agent state attributes synced as memories: (attribute, memory type, text label)
+AGENT_STATE_FIELDS = (
+    ("name", "agent_name", "Sleep agent name"),
+    ("description", "agent_description", "Sleep agent description"),
+    ("system", "system_prompt", "Sleep agent system prompt")
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_letta_client(token: str) -> Letta:
+    """Return a Letta client for the token, reusing its connection pool across calls."""
+    return Letta(token=token, timeout=60.0)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_agent_config_cached(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Read and parse an agent configuration file.
+    
+    Cached on the file's path, modification time, and size so an unchanged
+    file is parsed only once while edits invalidate the cached entry.
+    
+    Args:
+        file_path (str): Absolute path to the agent configuration file.
+        mtime_ns (int): Modification time of the file, part of the cache key.
+        size (int): Size of the file in bytes, part of the cache key.
+        
+    Returns:
+        Dict[str, Any]: Parsed agent configuration.
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(content) if orjson is not None else json.loads(content)
 
 
 def load_agent_config(file_path: str = "agent_config.json") -> Optional[Dict[str, Any]]:
@@ -25,9 +97,11 @@ def load_agent_config(file_path: str = "agent_config.json") -> Optional[Dict[str
         Optional[Dict[str, Any]]: Agent configuration if found, None otherwise.
     """
     try:
-        with open(file_path, 'r') as f:
-            config = json.load(f)
-            return config
+        abs_path = os.path.abspath(file_path)
+        st = os.stat(abs_path)
+        # Copy so callers can't mutate the cached dict
+        config = dict(_load_agent_config_cached(abs_path, st.st_mtime_ns, st.st_size))
+        return config
     except FileNotFoundError:
         print(f"Error: Agent config file '{file_path}' not found.")
         return None
@@ -44,6 +118,9 @@ class SleepMemorySynchronizer:
     in MongoDB for persistent, searchable memory.
     """
     
+    # Seconds a retrieved Letta group is reused before it is fetched again
+    GROUP_CACHE_TTL = 30.0
+    
     def __init__(self):
         """
         Initialize the SleepMemorySynchronizer.
@@ -52,12 +129,12 @@ class SleepMemorySynchronizer:
             ValueError: If required API keys or agent ID are missing.
             Exception: If initialization of services fails.
         """
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables once per process
+        _ensure_env()
         
         # Initialize MongoDB memory
         try:
-            self.mongo_memory = MongoDBMemory()
+            self.mongo_memory = get_mongo_memory()
             print("MongoDB memory initialized successfully")
         except Exception as e:
             print(f"Failed to initialize MongoDB memory: {str(e)}")
@@ -80,12 +157,9 @@ class SleepMemorySynchronizer:
         if not self.agent_id:
             raise ValueError("Agent ID not found in agent_config.json")
         
-        # Initialize Letta client
+        # Initialize (or reuse) the process-wide Letta client
         try:
-            self.letta_client = Letta(
-                token=self.letta_api_token,
-                timeout=60.0
-            )
+            self.letta_client = _get_letta_client(self.letta_api_token)
             print(f"Letta client initialized for {self.agent_type}: {self.agent_id}")
             if self.group_id:
                 print(f"Sleep agent group ID: {self.group_id}")
@@ -93,8 +167,85 @@ class SleepMemorySynchronizer:
             print(f"Failed to initialize Letta client: {str(e)}")
             raise
         
+        self._group_cache: Optional[Tuple[float, Any]] = None
+        
+        # Content hashes of core and state blocks already stored, so unchanged
+        # blocks are not re-embedded or re-inserted; MongoDBMemory's unique index
+        # guards against concurrent syncers. Chat relies on the sync cursor instead,
+        # since repeated message text ("yes", "thanks") must still be stored.
+        try:
+            self._seen_hashes = self.mongo_memory.get_content_hashes(self.agent_id, DEDUPED_SOURCES)
+        except Exception as e:
+            print(f"Warning: Could not load stored content hashes: {str(e)}")
+            self._seen_hashes = set()
+        
         print("SleepMemorySynchronizer initialized successfully")
     
+    def _chat_metadata(self, message: Any) -> Dict[str, Any]:
+        """
+        Build the metadata stored with one chat message.
+        
+        Args:
+            message (Any): Message returned by Letta.
+            
+        Returns:
+            Dict[str, Any]: Metadata for the chat memory.
+        """
+        return {
+            "source": SRC_CHAT,
+            "agent_id": self.agent_id,
+            "group_id": self.group_id,
+            "agent_type": AGENT_TYPE_SLEEP,
+            "message_id": str(getattr(message, 'id', '')),
+            "role": getattr(message, 'role', 'unknown'),
+            "timestamp": getattr(message, 'created_at', None),
+            "tool_calls": getattr(message, 'tool_calls', None),
+            "tool_call_id": getattr(message, 'tool_call_id', None)
+        }
+    
+    def _append_if_new(
+        self, 
+        pending: List[Tuple[str, Dict[str, Any]]], 
+        text_content: str, 
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """
+        Queue a memory for storage unless the same text was already synchronized
+        for the same source and agent.
+        
+        Args:
+            pending (List[Tuple[str, Dict[str, Any]]]): Memories queued for storage.
+            text_content (str): The text content to store.
+            metadata (Dict[str, Any]): Metadata for the memory.
+            
+        Returns:
+            bool: True if the memory was queued, False if it is a duplicate.
+        """
+        content_hash = self.mongo_memory.content_hash(
+            text_content, metadata.get("source"), metadata.get("agent_id")
+        )
+        if content_hash in self._seen_hashes:
+            return False
+        
+        self._seen_hashes.add(content_hash)
+        pending.append((text_content, metadata))
+        return True
+    
+    def _get_group(self) -> Any:
+        """
+        Get the agent's Letta group, reusing a recent retrieval.
+        
+        Returns:
+            Any: The group returned by Letta.
+        """
+        cached = self._group_cache
+        if cached and time.monotonic() - cached[0] < self.GROUP_CACHE_TTL:
+            return cached[1]
+        
+        group = self.letta_client.groups.retrieve(group_id=self.group_id)
+        self._group_cache = (time.monotonic(), group)
+        return group
+    
     def get_sleep_agent_memories(self) -> List[str]:
         """
         Get memories from the sleep agent in the multi-agent group.
@@ -108,14 +259,15 @@ class SleepMemorySynchronizer:
                 return []
             
             # Get group information
-            group = self.letta_client.groups.retrieve(group_id=self.group_id)
-            sleep_agents = []
+            group = self._get_group()
             
-            if hasattr(group, 'agents'):
-                for agent_id in group.agents:
-                    if agent_id != self.agent_id:  # This is likely the sleep agent
-                        sleep_agents.append(agent_id)
-                        print(f"Found sleep agent: {agent_id}")
+            # Every group member other than the primary agent is likely a sleep agent
+            agents = getattr(group, 'agents', None) or ()
+            sleep_agents = [agent_id for agent_id in agents if agent_id != self.agent_id]
+            
+            print(f"Found {len(sleep_agents)} sleep agents")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sleep agents: %s", sleep_agents)
             
             return sleep_agents
             
@@ -123,89 +275,82 @@ class SleepMemorySynchronizer:
             print(f"Error getting sleep agent memories: {str(e)}")
             return []
     
-    def sync_core_memory(self) -> int:
+    def collect_core_memory(self) -> List[Tuple[str, Dict[str, Any]]]:
         """
-        Synchronize core memory blocks from Letta agent to MongoDB.
-        For sleep agents, we sync the primary agent's memory blocks which are managed by the sleep agent.
+        Collect new core memory blocks from the Letta agent without storing them.
         
         Returns:
-            int: Number of core memory blocks synchronized.
+            List[Tuple[str, Dict[str, Any]]]: (text_content, metadata) pairs to store.
             
         Raises:
-            Exception: If core memory retrieval or storage fails.
+            Exception: If core memory retrieval fails.
         """
-        try:
-            print("Syncing core memory blocks from sleep-enabled agent...")
-            
-            # Get core memory from the primary agent (which is managed by sleep agent)
-            core_memory = self.letta_client.agents.core_memory.retrieve(agent_id=self.agent_id)
+        print("Syncing core memory blocks from sleep-enabled agent...")
+        
+        # Get core memory from the primary agent (which is managed by sleep agent)
+        core_memory = self.letta_client.agents.core_memory.retrieve(agent_id=self.agent_id)
+        
+        pending = []
+        base_meta = {
+            "source": SRC_CORE,
+            "agent_id": self.agent_id,
+            "group_id": self.group_id,
+            "agent_type": AGENT_TYPE_SLEEP
+        }
+        
+        # Process human and persona memory blocks
+        for block_type in ('human', 'persona'):
+            value = getattr(core_memory, block_type, None)
+            if not value:
+                continue
             
-            synchronized_count = 0
+            text_content = str(value)
+            metadata = {**base_meta, "type": block_type}
             
-            # Process human memory block
-            if hasattr(core_memory, 'human') and core_memory.human:
-                text_content = str(core_memory.human)
-                metadata = {
-                    "source": "letta_sleep_core_memory",
-                    "type": "human",
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent"
-                }
+            if not self._append_if_new(pending, text_content, metadata):
+                continue
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Synced %s memory block: %.50s...", block_type, text_content)
+        
+        # Get any additional memory blocks that may have been created by the sleep agent
+        try:
+            blocks = self.letta_client.agents.blocks.list(agent_id=self.agent_id)
+            for block in blocks:
+                label = getattr(block, 'label', None)
+                value = getattr(block, 'value', None)
+                if label is None or label in ('human', 'persona') or not value:
+                    continue
                 
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                print(f"Synced human memory block: {text_content[:50]}...")
-                synchronized_count += 1
-            
-            # Process persona memory block
-            if hasattr(core_memory, 'persona') and core_memory.persona:
-                text_content = str(core_memory.persona)
-                metadata = {
-                    "source": "letta_sleep_core_memory",
-                    "type": "persona",
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent"
-                }
+                text_content = str(value)
+                metadata = {**base_meta, "type": label}
                 
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                print(f"Synced persona memory block: {text_content[:50]}...")
-                synchronized_count += 1
-            
-            # Get any additional memory blocks that may have been created by the sleep agent
-            try:
-                blocks = self.letta_client.agents.blocks.list(agent_id=self.agent_id)
-                for block in blocks:
-                    if hasattr(block, 'label') and block.label not in ['human', 'persona']:
-                        if hasattr(block, 'value') and block.value:
-                            text_content = str(block.value)
-                            metadata = {
-                                "source": "letta_sleep_core_memory",
-                                "type": block.label,
-                                "agent_id": self.agent_id,
-                                "group_id": self.group_id,
-                                "agent_type": "sleep_agent"
-                            }
-                            
-                            self.mongo_memory.add_memory(text_content, metadata=metadata)
-                            print(f"Synced {block.label} memory block: {text_content[:50]}...")
-                            synchronized_count += 1
-            except Exception as e:
-                print(f"Warning: Could not retrieve additional memory blocks: {str(e)}")
-            
-            print(f"Core memory synchronization complete: {synchronized_count} blocks")
-            return synchronized_count
-            
+                if not self._append_if_new(pending, text_content, metadata):
+                    continue
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Synced %s memory block: %.50s...", label, text_content)
         except Exception as e:
-            print(f"Error syncing core memory: {str(e)}")
-            raise
+            print(f"Warning: Could not retrieve additional memory blocks: {str(e)}")
+        
+        return pending
     
-    def sync_chat_history(self, limit: int = 100) -> int:
+    def sync_chat_history(
+        self, 
+        limit: int = 100, 
+        page_size: int = 20, 
+        max_concurrency: int = 16
+    ) -> int:
         """
         Synchronize chat history from Letta agent to MongoDB.
         
+        Messages are fetched in pages. The next page is requested while the
+        current one is written, and up to max_concurrency page writes
+        (embedding + bulk insert) run at the same time. Only messages newer
+        than the last synchronized message are fetched.
+        
         Args:
             limit (int): Maximum number of messages to sync.
+            page_size (int): Number of messages fetched and written per page.
+            max_concurrency (int): Maximum number of page writes in flight at once.
             
         Returns:
             int: Number of messages synchronized.
@@ -216,35 +361,29 @@ class SleepMemorySynchronizer:
         try:
             print(f"Syncing chat history from sleep-enabled agent (limit: {limit})...")
             
-            # Get messages from the primary agent
-            messages = self.letta_client.agents.messages.list(
-                agent_id=self.agent_id,
-                limit=limit
-            )
+            write_futures = []
+            newest_id = None
             
-            synchronized_count = 0
-            
-            for message in messages:
-                # Skip empty messages
-                if not hasattr(message, 'text') or not message.text or message.text.strip() == "":
-                    continue
+            with ThreadPoolExecutor(max_workers=max_concurrency) as writer:
+                for page in self._iter_chat_pages(limit, page_size):
+                    if newest_id is None and page:
+                        newest_id = getattr(page[-1], 'id', None)
+                    
+                    pending = self._collect_chat_messages(page)
+                    if pending:
+                        write_futures.append(
+                            writer.submit(
+                                self.mongo_memory.add_memories_bulk,
+                                pending,
+                                batch_size=page_size
+                            )
+                        )
                 
-                text_content = message.text
-                metadata = {
-                    "source": "letta_sleep_chat_history",
-                    "role": getattr(message, 'role', 'unknown'),
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent",
-                    "message_id": str(getattr(message, 'id', '')),
-                    "timestamp": getattr(message, 'created_at', None),
-                    "tool_calls": getattr(message, 'tool_calls', None),
-                    "tool_call_id": getattr(message, 'tool_call_id', None)
-                }
-                
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                print(f"Synced {metadata['role']} message: {text_content[:50]}...")
-                synchronized_count += 1
+                synchronized_count = sum(future.result() for future in write_futures)
+            
+            # Advance the cursor only once every page has been written
+            if newest_id:
+                self.mongo_memory.set_sync_cursor(self.agent_id, str(newest_id))
             
             print(f"Chat history synchronization complete: {synchronized_count} messages")
             return synchronized_count
@@ -253,87 +392,135 @@ class SleepMemorySynchronizer:
             print(f"Error syncing chat history: {str(e)}")
             raise
     
-    def sync_sleep_agent_state(self) -> int:
+    def _iter_chat_pages(self, limit: int, page_size: int) -> Iterator[List[Any]]:
         """
-        Synchronize sleep agent state information to MongoDB.
+        Yield pages of messages newer than the sync cursor, newest page first.
         
-        Returns:
-            int: Number of state items synchronized.
+        The next (older) page is requested in the background while the caller
+        processes the current one.
+        
+        Args:
+            limit (int): Maximum number of messages to fetch.
+            page_size (int): Number of messages fetched per request.
             
-        Raises:
-            Exception: If agent state retrieval or storage fails.
+        Yields:
+            List[Any]: Messages in each page, oldest first.
         """
-        try:
-            print("Syncing sleep agent state information...")
-            
-            # Get primary agent details
-            agent = self.letta_client.agents.retrieve(agent_id=self.agent_id)
-            
-            synchronized_count = 0
+        since = self.mongo_memory.get_sync_cursor(self.agent_id)
+        
+        with ThreadPoolExecutor(max_workers=1) as fetcher:
+            remaining = limit
+            request_size = min(page_size, remaining)
+            next_page = fetcher.submit(self._fetch_chat_page, request_size, None, since)
             
-            # Sync agent name
-            if hasattr(agent, 'name') and agent.name:
-                text_content = f"Sleep agent name: {agent.name}"
-                metadata = {
-                    "source": "letta_sleep_agent_state",
-                    "type": "agent_name",
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent"
-                }
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                synchronized_count += 1
+            while next_page is not None:
+                page = next_page.result()
+                remaining -= len(page)
+                
+                # A short page means the history is exhausted
+                next_page = None
+                cursor = getattr(page[0], 'id', None) if page else None
+                if cursor and len(page) >= request_size and remaining > 0:
+                    request_size = min(page_size, remaining)
+                    next_page = fetcher.submit(self._fetch_chat_page, request_size, cursor, since)
+                
+                yield page
+    
+    def _fetch_chat_page(
+        self, 
+        limit: int, 
+        before: Optional[str], 
+        after: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Fetch one page of messages from the primary agent.
+        
+        Args:
+            limit (int): Maximum number of messages in the page.
+            before (Optional[str]): Message ID cursor; only messages older than it are returned.
+            after (Optional[str]): Message ID cursor; only messages newer than it are returned.
             
-            # Sync agent description if available
-            if hasattr(agent, 'description') and agent.description:
-                text_content = f"Sleep agent description: {agent.description}"
-                metadata = {
-                    "source": "letta_sleep_agent_state",
-                    "type": "agent_description",
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent"
-                }
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                synchronized_count += 1
+        Returns:
+            List[Any]: Messages in the page, oldest first.
+        """
+        params = {"agent_id": self.agent_id, "limit": limit}
+        if before:
+            params["before"] = before
+        if after:
+            params["after"] = after
+        return list(self.letta_client.agents.messages.list(**params))
+    
+    def _collect_chat_messages(self, messages: List[Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Convert Letta messages into (text, metadata) pairs for storage.
+        
+        Args:
+            messages (List[Any]): Messages returned by Letta.
             
-            # Sync system prompt if available
-            if hasattr(agent, 'system') and agent.system:
-                text_content = f"Sleep agent system prompt: {agent.system}"
-                metadata = {
-                    "source": "letta_sleep_agent_state",
-                    "type": "system_prompt",
-                    "agent_id": self.agent_id,
-                    "group_id": self.group_id,
-                    "agent_type": "sleep_agent"
-                }
-                self.mongo_memory.add_memory(text_content, metadata=metadata)
-                synchronized_count += 1
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Memories to store, skipping empty messages.
+        """
+        pending = []
+        
+        for message in messages:
+            # Skip empty messages
+            text_content = getattr(message, 'text', None)
+            if not text_content or not text_content.strip():
+                continue
             
-            # Sync sleep agent configuration
-            if self.group_id:
-                try:
-                    group = self.letta_client.groups.retrieve(group_id=self.group_id)
-                    if hasattr(group, 'sleep_time_agent_frequency'):
-                        text_content = f"Sleep agent frequency: {group.sleep_time_agent_frequency}"
-                        metadata = {
-                            "source": "letta_sleep_agent_state",
-                            "type": "sleep_frequency",
-                            "agent_id": self.agent_id,
-                            "group_id": self.group_id,
-                            "agent_type": "sleep_agent"
-                        }
-                        self.mongo_memory.add_memory(text_content, metadata=metadata)
-                        synchronized_count += 1
-                except Exception as e:
-                    print(f"Warning: Could not retrieve group information: {str(e)}")
+            metadata = self._chat_metadata(message)
+            pending.append((text_content, metadata))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Synced %s message: %.50s...", metadata["role"], text_content)
+        
+        return pending
+    
+    def collect_sleep_agent_state(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Collect new sleep agent state information without storing it.
+        
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: (text_content, metadata) pairs to store.
             
-            print(f"Sleep agent state synchronization complete: {synchronized_count} items")
-            return synchronized_count
+        Raises:
+            Exception: If agent state retrieval fails.
+        """
+        print("Syncing sleep agent state information...")
+        
+        # Get primary agent details
+        agent = self.letta_client.agents.retrieve(agent_id=self.agent_id)
+        
+        pending = []
+        base_meta = {
+            "source": SRC_STATE,
+            "agent_id": self.agent_id,
+            "group_id": self.group_id,
+            "agent_type": AGENT_TYPE_SLEEP
+        }
+        
+        # Sync agent name, description, and system prompt if available
+        for attr, state_type, label in AGENT_STATE_FIELDS:
+            value = getattr(agent, attr, None)
+            if not value:
+                continue
             
-        except Exception as e:
-            print(f"Error syncing sleep agent state: {str(e)}")
-            raise
+            text_content = f"{label}: {value}"
+            metadata = {**base_meta, "type": state_type}
+            self._append_if_new(pending, text_content, metadata)
+        
+        # Sync sleep agent configuration
+        if self.group_id:
+            try:
+                group = self._get_group()
+                frequency = getattr(group, 'sleep_time_agent_frequency', None)
+                if frequency is not None:
+                    text_content = f"Sleep agent frequency: {frequency}"
+                    metadata = {**base_meta, "type": "sleep_frequency"}
+                    self._append_if_new(pending, text_content, metadata)
+            except Exception as e:
+                print(f"Warning: Could not retrieve group information: {str(e)}")
+        
+        return pending
     
     def get_sync_statistics(self) -> Dict[str, Any]:
         """
@@ -361,9 +548,14 @@ class SleepMemorySynchronizer:
             return {"error": str(e)}
 
 
-def sync_sleep_memories() -> bool:
+async def async_sync_sleep_memories() -> bool:
     """
-    Main function to synchronize all memories from Letta sleep agent to MongoDB.
+    Synchronize all memories from Letta sleep agent to MongoDB.
+    
+    Core memory, chat history, and agent state hit independent Letta endpoints,
+    so the three are fetched concurrently. Core memory and agent state are
+    written together in a single embedding pass and bulk write; chat history
+    is written page by page while the next page is fetched.
     
     Returns:
         bool: True if synchronization was successful, False otherwise.
@@ -375,24 +567,35 @@ def sync_sleep_memories() -> bool:
         # Initialize synchronizer
         synchronizer = SleepMemorySynchronizer()
         
-        total_synced = 0
-        
         # Get sleep agent information
         sleep_agents = synchronizer.get_sleep_agent_memories()
         if sleep_agents:
             print(f"Found {len(sleep_agents)} sleep agent(s) in group")
         
-        # Sync core memory (managed by sleep agent)
-        core_count = synchronizer.sync_core_memory()
-        total_synced += core_count
-        
-        # Sync chat history
-        chat_count = synchronizer.sync_chat_history()
-        total_synced += chat_count
+        async def sync_blocks() -> Tuple[int, int, int]:
+            core_pending, state_pending = await asyncio.gather(
+                asyncio.to_thread(synchronizer.collect_core_memory),
+                asyncio.to_thread(synchronizer.collect_sleep_agent_state)
+            )
+            
+            # Core memory and agent state are written in one bulk operation
+            pending = core_pending + state_pending
+            print(f"Flushing {len(pending)} core memory and agent state records in one bulk write...")
+            flush_start = time.perf_counter()
+            synced = await asyncio.to_thread(
+                synchronizer.mongo_memory.add_memories_bulk, pending, dedupe=True
+            )
+            print(f"Flushed {synced} records in {(time.perf_counter() - flush_start) * 1000:.0f}ms")
+            return len(core_pending), len(state_pending), synced
         
-        # Sync sleep agent state
-        state_count = synchronizer.sync_sleep_agent_state()
-        total_synced += state_count
+        # Core memory (managed by sleep agent) and agent state sync alongside
+        # chat history, which is written page by page while the next page is
+        # fetched and advances the chat cursor once its pages are stored
+        (core_count, state_count, blocks_synced), chat_count = await asyncio.gather(
+            sync_blocks(),
+            asyncio.to_thread(synchronizer.sync_chat_history)
+        )
+        total_synced = blocks_synced + chat_count
         
         # Get final statistics
         stats = synchronizer.get_sync_statistics()
@@ -415,8 +618,8 @@ def sync_sleep_memories() -> bool:
         
         print("=== Sleep Agent Memory Synchronization Complete ===")
         
-        # Clean up
-        synchronizer.mongo_memory.close()
+        # The shared MongoDB connection stays open for the process lifetime
+        # and is closed at exit
         
         return True
         
@@ -425,6 +628,16 @@ def sync_sleep_memories() -> bool:
         return False
 
 
+def sync_sleep_memories() -> bool:
+    """
+    Main function to synchronize all memories from Letta sleep agent to MongoDB.
+    
+    Returns:
+        bool: True if synchronization was successful, False otherwise.
+    """
+    return asyncio.run(async_sync_sleep_memories())
+
+
 if __name__ == "__main__":
     """
     Run sleep agent memory synchronization when script is executed directly.
@@ -5,15 +5,72 @@ This module provides functions to store and retrieve memories from MongoDB
 with vector search capabilities using Voyage AI embeddings.
 """
 
+import io
 import os
 import json
-from typing import List, Dict, Optional, Any
+import time
+import logging
+import asyncio
+import atexit
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Set, Tuple
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from pymongo.write_concern import WriteConcern
+from bson.binary import Binary
+
+# Native BSON vectors need pymongo 4.10+; older drivers store float arrays
+try:
+    from bson.binary import BinaryVectorDtype
+except ImportError:
+    BinaryVectorDtype = None
 from voyage import VoyageEmbedder
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Per-call progress is logged at DEBUG; the default WARNING level keeps the
+# hot path quiet
+logger = logging.getLogger(__name__)
+
+# Load .env once per process rather than on every instantiation
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time this is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_ensure_env()
+
 
 class MongoDBMemory:
     """
@@ -23,12 +80,82 @@ class MongoDBMemory:
     and format results for LLM consumption.
     """
     
+    # Connection pool tuned for bursty bulk sync writes: keep sockets warm and
+    # cap concurrent connection establishment. When sizing a replica set, each
+    # client opens up to (maxPoolSize + 1 monitoring + 1 RTT) connections per member.
+    DEFAULT_POOL_OPTIONS = {
+        "maxPoolSize": 50,
+        "minPoolSize": 10,
+        "maxConnecting": 4,
+        "socketTimeoutMS": 30000,
+        "serverSelectionTimeoutMS": 5000
+    }
+    
+    # Memories whose UTF-8 text is longer than this many bytes are stored
+    # zstd-compressed (when that actually shrinks them), with a short
+    # uncompressed preview kept alongside for display and text search
+    COMPRESS_MIN_LENGTH = 1024
+    TEXT_PREVIEW_LENGTH = 200
+    ZSTD_LEVEL = 3
+    
+    # Fields covered by the collection's single text index, used by the
+    # text-search fallback
+    TEXT_INDEX_FIELDS = ("text", "text_preview")
+    
+    # Maximum number of texts sent to Voyage in one embedding request
+    EMBEDDING_BATCH_SIZE = 128
+    
+    # Recent search_memories results are reused for the same query, or for a
+    # query whose embedding is nearly identical to a cached one
+    QUERY_CACHE_SIZE = 512
+    QUERY_CACHE_TTL = 300.0
+    SEMANTIC_CACHE_THRESHOLD = 0.97
+    
+    # Server error codes meaning the vector search index does not exist; while
+    # it is missing, searches go straight to text search for a while
+    VECTOR_INDEX_MISSING_CODES = (31082, 6047401)
+    VECTOR_INDEX_RETRY_SECONDS = 60.0
+    
+    # Invariant aggregation stages, shared by every search instead of being
+    # rebuilt per call; only the query-specific stages are built per search
+    _SEARCH_PROJECT_STAGE = {
+        "$project": {
+            "_id": 0,
+            "text": 1,
+            "text_zstd": 1,
+            "text_preview": 1,
+            "metadata": 1,
+            "created_at": 1,
+            "embedding_model": 1,
+            "score": {"$meta": "vectorSearchScore"}
+        }
+    }
+    _TEXT_SEARCH_SORT_STAGE = {"$sort": {"score": {"$meta": "textScore"}}}
+    _TEXT_SEARCH_PROJECT_STAGE = {
+        "$project": {
+            "_id": 0,
+            "text": 1,
+            "text_zstd": 1,
+            "text_preview": 1,
+            "metadata": {"$ifNull": ["$metadata", {}]},
+            "created_at": 1,
+            "embedding_model": 1,
+            "score": {"$meta": "textScore"}
+        }
+    }
+    _SOURCES_PIPELINE = [
+        {"$group": {"_id": "$metadata.source", "count": {"$sum": 1}}}
+    ]
+    
     def __init__(
         self, 
         connection_string: Optional[str] = None,
         db_name: Optional[str] = None,
         collection_name: Optional[str] = None,
-        voyage_embedder: Optional[VoyageEmbedder] = None
+        voyage_embedder: Optional[VoyageEmbedder] = None,
+        pool_options: Optional[Dict[str, Any]] = None,
+        fast_insert: bool = True,
+        embedding_cache_path: Optional[str] = VoyageEmbedder.EMBEDDING_CACHE_FILE
     ):
         """
         Initialize the MongoDBMemory.
@@ -38,14 +165,19 @@ class MongoDBMemory:
             db_name (Optional[str]): Database name. Defaults to "toolmemory".
             collection_name (Optional[str]): Collection name. Defaults to "memories".
             voyage_embedder (Optional[VoyageEmbedder]): Embedder instance. If None, creates new one.
+            pool_options (Optional[Dict[str, Any]]): MongoClient pool options, overriding
+                DEFAULT_POOL_OPTIONS.
+            fast_insert (bool): Write add_memory / add_memories documents with an
+                unacknowledged (w=0) write concern. Inserts no longer wait for the
+                server, but failed writes are silently lost and inserted counts are
+                unknown. Reads and add_memories_bulk always stay acknowledged.
+            embedding_cache_path (Optional[str]): SQLite file caching embeddings
+                across runs, used when creating the embedder. None disables the cache.
             
         Raises:
             ValueError: If connection string is not provided and not found in environment.
             Exception: If MongoDB connection fails.
         """
-        # Load environment variables
-        load_dotenv()
-        
         # Get connection parameters
         self.connection_string = connection_string or os.getenv("MONGO_CONNECTION_STRING")
         if not self.connection_string:
@@ -56,22 +188,108 @@ class MongoDBMemory:
         
         # Initialize MongoDB client
         try:
-            self.client = MongoClient(self.connection_string)
+            client_options = {**self.DEFAULT_POOL_OPTIONS, **(pool_options or {})}
+            self.client = MongoClient(self.connection_string, **client_options)
             self.db = self.client[self.db_name]
             self.collection = self.db[self.collection_name]
+            # Memories are a loss-tolerant cache, so plain inserts can skip the ack
+            self._write_collection = (
+                self.collection.with_options(write_concern=WriteConcern(w=0))
+                if fast_insert else self.collection
+            )
+            self.sync_cursors = self.db["sync_cursors"]
             
             # Test connection
             self.client.admin.command('ping')
-            print(f"Successfully connected to MongoDB: {self.db_name}.{self.collection_name}")
+            logger.info("Successfully connected to MongoDB: %s.%s", self.db_name, self.collection_name)
             
         except Exception as e:
-            print(f"Failed to connect to MongoDB: {str(e)}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             raise
         
+        self._ensure_indexes()
+        
         # Initialize embedder
-        self.embedder = voyage_embedder if voyage_embedder else VoyageEmbedder()
+        self._owns_embedder = voyage_embedder is None
+        self.embedder = voyage_embedder if voyage_embedder else VoyageEmbedder(cache_path=embedding_cache_path)
+        
+        # zstd contexts are not safe to share between threads, so each bulk
+        # writer thread gets its own
+        self._zstd_local = threading.local()
+        
+        # (query_text, top_k, vector_field_name, index_name, num_candidates) ->
+        # (slot, results, stored_at), with each query's embedding kept in row
+        # `slot` of the cache vector storage
+        self._vector_index_missing_until = 0.0
+        
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Bumped on every write, so searches that started before a write do
+        # not cache their now stale results
+        self._cache_generation = 0
+        self._cache_dim = None
+        self._free_cache_slots = []
+        
+        logger.info("MongoDBMemory initialized successfully")
+    
+    def _ensure_indexes(self) -> None:
+        """
+        Create the regular indexes used by sync statistics, incremental sync,
+        deduplication, and the text-search fallback. Creating an index that
+        already exists is a no-op, and each index is attempted independently.
+        """
+        index_specs = [
+            (
+                [
+                    ("metadata.agent_id", pymongo.ASCENDING),
+                    ("metadata.source", pymongo.ASCENDING),
+                    ("metadata.timestamp", pymongo.DESCENDING)
+                ],
+                {"name": "agent_source_timestamp"}
+            ),
+            ("_content_hash", {"unique": True, "sparse": True}),
+            ([("created_at", pymongo.DESCENDING)], {}),
+            ([("metadata.source", pymongo.ASCENDING)], {})
+        ]
+        for keys, options in index_specs:
+            try:
+                self.collection.create_index(keys, **options)
+            except Exception as e:
+                logger.warning("Could not create memory index %s: %s", keys, e)
+        
+        self._ensure_text_index()
+    
+    def _ensure_text_index(self) -> None:
+        """
+        Ensure the text index covers TEXT_INDEX_FIELDS.
+        
+        MongoDB allows a single text index per collection, so an older text
+        index (such as the original text-only one) is dropped and rebuilt
+        with the current fields.
+        """
+        try:
+            indexes = self.collection.index_information()
+        except Exception as e:
+            logger.warning("Could not list memory indexes: %s", e)
+            return
+        
+        for name, info in indexes.items():
+            weights = info.get("weights")
+            if weights is None:
+                continue
+            if set(weights) == set(self.TEXT_INDEX_FIELDS):
+                return
+            logger.info("Replacing text index %s to cover %s", name, ", ".join(self.TEXT_INDEX_FIELDS))
+            try:
+                self.collection.drop_index(name)
+            except Exception as e:
+                logger.warning("Could not drop text index %s: %s", name, e)
+                return
         
-        print("MongoDBMemory initialized successfully")
+        try:
+            self.collection.create_index([(field, "text") for field in self.TEXT_INDEX_FIELDS])
+        except Exception as e:
+            logger.warning("Could not create text index: %s", e)
     
     def _ensure_vector_index(
         self, 
@@ -81,6 +299,10 @@ class MongoDBMemory:
         """
         Ensure a vector search index exists on the embedding field.
         
+        Stored and query embeddings are L2-normalized on the client, so the
+        index uses dotProduct similarity, which ranks identically to cosine
+        without re-normalizing every candidate per query.
+        
         Note: For MongoDB Atlas, vector search indexes are typically created 
         via the Atlas UI or Atlas Admin API. This method provides the index 
         definition for reference.
@@ -101,15 +323,19 @@ class MongoDBMemory:
                         "type": "vector",
                         "path": vector_field_name,
                         "numDimensions": embedding_dim,  # Actual dimension from sample
-                        "similarity": "cosine"
+                        "similarity": "dotProduct"
                     }
                 ]
             }
         }
         
-        print(f"Vector index definition for Atlas (create via Atlas UI):")
-        print(json.dumps(index_definition, indent=2))
-        print(f"Required dimensions: {embedding_dim}")
+        logger.info("Vector index definition for Atlas (create via Atlas UI):\n%s", json.dumps(index_definition, indent=2))
+        logger.info("Required dimensions: %d", embedding_dim)
+        logger.info(
+            "Migration note: an existing index '%s' built with cosine similarity should be "
+            "recreated with dotProduct; memories stored earlier keep working since Voyage "
+            "embeddings are already unit length", index_name
+        )
         
         # Note: Atlas vector search indexes must be created via Atlas UI or Admin API
         # This method just provides the definition for reference
@@ -134,44 +360,395 @@ class MongoDBMemory:
         """
         try:
             # Generate embedding for the text content
-            print(f"Generating embedding for memory: {text_content[:50]}...")
-            embedding = self.embedder.get_embedding(text_content, input_type="document")
+            logger.debug("Generating embedding for memory: %.50s...", text_content)
+            embedding = self._embed_documents([text_content])[0]
             
             # Prepare document
-            doc = {
-                "text": text_content,
-                "embedding": embedding,
-                "metadata": metadata or {},
-                "created_at": datetime.now(timezone.utc),
-                "embedding_model": self.embedder.model,
-                "embedding_dimension": len(embedding)
-            }
+            doc = self._build_memory_doc(text_content, embedding, metadata)
             
             # Insert document
-            result = self.collection.insert_one(doc)
-            print(f"Memory added successfully with ID: {result.inserted_id}")
+            result = self._write_collection.insert_one(doc)
+            self._invalidate_query_cache()
+            logger.debug("Memory added successfully with ID: %s", result.inserted_id)
             
             return str(result.inserted_id)
             
         except Exception as e:
-            print(f"Error adding memory: {str(e)}")
+            logger.error("Error adding memory: %s", e)
+            raise
+    
+    def add_memories(
+        self, 
+        texts: List[str], 
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[str]:
+        """
+        Add several memories with batched embedding calls and insert_many.
+        
+        Texts are embedded in chunks of EMBEDDING_BATCH_SIZE, and each chunk is
+        written with one unordered insert_many.
+        
+        Args:
+            texts (List[str]): The text contents to store.
+            metadatas (Optional[List[Optional[Dict[str, Any]]]]): Metadata for each text.
+            
+        Returns:
+            List[str]: The inserted document IDs.
+            
+        Raises:
+            ValueError: If metadatas does not match texts in length.
+            Exception: If embedding generation or database insertion fails.
+        """
+        if metadatas is None:
+            metadatas = [None] * len(texts)
+        elif len(metadatas) != len(texts):
+            raise ValueError("metadatas must have the same length as texts")
+        
+        inserted_ids = []
+        
+        try:
+            for start in range(0, len(texts), self.EMBEDDING_BATCH_SIZE):
+                chunk = texts[start:start + self.EMBEDDING_BATCH_SIZE]
+                logger.debug("Generating embeddings for %d memories...", len(chunk))
+                embeddings = self._embed_documents(chunk)
+                
+                docs = [
+                    self._build_memory_doc(text_content, embedding, metadata)
+                    for text_content, embedding, metadata
+                    in zip(chunk, embeddings, metadatas[start:start + self.EMBEDDING_BATCH_SIZE])
+                ]
+                # bypass_document_validation is not allowed with w=0 writes
+                result = self._write_collection.insert_many(docs, ordered=False)
+                self._invalidate_query_cache()
+                inserted_ids.extend(str(inserted_id) for inserted_id in result.inserted_ids)
+            
+            logger.info("Added %d memories", len(inserted_ids))
+            return inserted_ids
+            
+        except Exception as e:
+            logger.error("Error adding memories: %s", e)
+            raise
+    
+    def add_memories_bulk(
+        self, 
+        items: List[Tuple[str, Optional[Dict[str, Any]]]], 
+        batch_size: int = 500,
+        max_concurrency: int = 1,
+        dedupe: bool = False
+    ) -> int:
+        """
+        Add several memories using batched embedding calls and bulk writes.
+        
+        Each batch is embedded with one API call and written with one unordered
+        bulk_write. Batches are not atomic: write errors in a batch are logged
+        and the remaining documents and batches are still inserted.
+        
+        Args:
+            items (List[Tuple[str, Optional[Dict[str, Any]]]]): (text_content, metadata) pairs.
+            batch_size (int): Maximum number of memories per embedding call and bulk write.
+            max_concurrency (int): Maximum number of batches processed at the same time.
+            dedupe (bool): Store a content hash with each memory and upsert on it, so
+                text already stored for the same source and agent is not inserted again.
+            
+        Returns:
+            int: Number of memories inserted.
+            
+        Raises:
+            Exception: If embedding generation or the database connection fails.
+        """
+        if not items:
+            return 0
+        
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        insert_batch = functools.partial(self._insert_batch, dedupe=dedupe)
+        
+        if max_concurrency > 1 and len(batches) > 1:
+            # MongoClient is thread-safe and pooled, so batches can share it
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+                inserted_count = sum(pool.map(insert_batch, batches))
+        else:
+            inserted_count = sum(insert_batch(batch) for batch in batches)
+        
+        logger.info("Added %d memories in bulk", inserted_count)
+        return inserted_count
+    
+    def _insert_batch(
+        self, 
+        batch: List[Tuple[str, Optional[Dict[str, Any]]]], 
+        dedupe: bool = False
+    ) -> int:
+        """
+        Embed and insert a single batch of memories.
+        
+        Args:
+            batch (List[Tuple[str, Optional[Dict[str, Any]]]]): (text_content, metadata) pairs.
+            dedupe (bool): Upsert on the content hash instead of inserting unconditionally.
+            
+        Returns:
+            int: Number of memories inserted from the batch.
+            
+        Raises:
+            Exception: If embedding generation or the database connection fails.
+        """
+        try:
+            texts = [text_content for text_content, _ in batch]
+            logger.debug("Generating embeddings for %d memories...", len(texts))
+            embeddings = self._embed_documents(texts)
+            
+            operations = []
+            for (text_content, metadata), embedding in zip(batch, embeddings):
+                doc = self._build_memory_doc(text_content, embedding, metadata)
+                if dedupe:
+                    doc["_content_hash"] = self.content_hash(
+                        text_content, (metadata or {}).get("source"), (metadata or {}).get("agent_id")
+                    )
+                    operations.append(UpdateOne(
+                        {"_content_hash": doc["_content_hash"]},
+                        {"$setOnInsert": doc},
+                        upsert=True
+                    ))
+                else:
+                    operations.append(InsertOne(doc))
+            
+            result = self.collection.bulk_write(operations, ordered=False)
+            inserted_count = result.upserted_count if dedupe else result.inserted_count
+            
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            logger.warning("%d of %d memories failed to insert", len(write_errors), len(batch))
+            inserted_count = e.details.get("nUpserted" if dedupe else "nInserted", 0)
+            
+        except Exception as e:
+            logger.error("Error adding memories in bulk: %s", e)
             raise
+        
+        if inserted_count:
+            self._invalidate_query_cache()
+        return inserted_count
+    
+    def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get document embeddings for memory texts.
+        
+        Texts are whitespace-normalized and truncated to the embedder's
+        max_text_chars before embedding, so formatting-only differences share an
+        embedder cache entry. The stored memory text is left unchanged.
+        
+        Args:
+            texts (List[str]): Texts to embed.
+            
+        Returns:
+            List[List[float]]: One embedding per text, in input order.
+        """
+        texts = [" ".join(text_content.split())[:self.embedder.max_text_chars] for text_content in texts]
+        return self.embedder.get_embeddings(texts, input_type="document")
+    
+    @staticmethod
+    def content_hash(
+        text_content: str, 
+        source: Optional[str] = None, 
+        agent_id: Optional[str] = None
+    ) -> str:
+        """
+        Hash memory text for deduplication.
+        
+        The source and agent are part of the hash, so identical text from
+        another agent or source is still stored.
+        
+        Args:
+            text_content (str): The text content to hash.
+            source (Optional[str]): Memory source, e.g. "core_memory".
+            agent_id (Optional[str]): Agent the memory belongs to.
+            
+        Returns:
+            str: Hex digest identifying the text within its source and agent.
+        """
+        key = f"{source or ''}\x00{agent_id or ''}\x00{text_content}"
+        return hashlib.blake2b(key.encode("utf-8")).hexdigest()
+    
+    def get_content_hashes(self, agent_id: str, sources: List[str]) -> Set[str]:
+        """
+        Get the content hashes of an agent's deduplicated memories.
+        
+        Args:
+            agent_id (str): Agent whose memories to read.
+            sources (List[str]): Memory sources that are deduplicated.
+            
+        Returns:
+            Set[str]: Content hashes already stored.
+        """
+        cursor = self.collection.find(
+            {
+                "metadata.agent_id": agent_id,
+                "metadata.source": {"$in": list(sources)},
+                "_content_hash": {"$exists": True}
+            },
+            {"_id": 0, "_content_hash": 1}
+        )
+        return {doc["_content_hash"] for doc in cursor}
+    
+    def get_sync_cursor(self, agent_id: str) -> Optional[str]:
+        """
+        Get the ID of the newest chat message already synchronized for an agent.
+        
+        Args:
+            agent_id (str): The Letta agent ID.
+            
+        Returns:
+            Optional[str]: The last synchronized message ID, or None on first sync.
+        """
+        doc = self.sync_cursors.find_one({"_id": agent_id}, {"message_id": 1})
+        return doc.get("message_id") if doc else None
+    
+    def set_sync_cursor(self, agent_id: str, message_id: str) -> None:
+        """
+        Record the newest chat message synchronized for an agent.
+        
+        Args:
+            agent_id (str): The Letta agent ID.
+            message_id (str): ID of the newest synchronized message.
+        """
+        self.sync_cursors.update_one(
+            {"_id": agent_id},
+            {"$set": {
+                "message_id": message_id,
+                "updated_at": datetime.now(timezone.utc)
+            }},
+            upsert=True
+        )
+    
+    def _build_memory_doc(
+        self, 
+        text_content: str, 
+        embedding: List[float], 
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the MongoDB document stored for a single memory.
+        
+        Args:
+            text_content (str): The text content to store.
+            embedding (List[float]): Embedding vector for the text.
+            metadata (Optional[Dict[str, Any]]): Additional metadata.
+            
+        Returns:
+            Dict[str, Any]: Document ready for insertion.
+        """
+        doc = {
+            "embedding": self._encode_embedding(self._unit_vector(embedding)),
+            "metadata": metadata or {},
+            "created_at": datetime.now(timezone.utc),
+            "embedding_model": self.embedder.model,
+            "embedding_dimension": len(embedding)
+        }
+        
+        raw = text_content.encode("utf-8") if zstandard is not None else b""
+        if len(raw) > self.COMPRESS_MIN_LENGTH:
+            compressor = getattr(self._zstd_local, "compressor", None)
+            if compressor is None:
+                compressor = self._zstd_local.compressor = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL)
+            compressed = compressor.compress(raw)
+            if len(compressed) < len(raw):
+                doc["text_zstd"] = Binary(compressed)
+                doc["text_len"] = len(text_content)
+                doc["text_preview"] = text_content[:self.TEXT_PREVIEW_LENGTH]
+                return doc
+        
+        doc["text"] = text_content
+        return doc
+    
+    @staticmethod
+    def _unit_vector(embedding: List[float]) -> List[float]:
+        """
+        Scale an embedding to unit length.
+        
+        Normalizing once at insert and query time lets vector search and the
+        semantic query cache score with a plain dot product.
+        
+        Args:
+            embedding (List[float]): Embedding vector.
+            
+        Returns:
+            List[float]: The L2-normalized embedding.
+        """
+        if np is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            return (vector / max(float(np.linalg.norm(vector)), 1e-12)).tolist()
+        norm = max(sum(x * x for x in embedding) ** 0.5, 1e-12)
+        return [x / norm for x in embedding]
+    
+    @staticmethod
+    def _encode_embedding(embedding: List[float]) -> Any:
+        """
+        Encode an embedding for storage.
+        
+        A packed float32 BSON vector (binary subtype 9) is about a third the
+        size of an array of BSON doubles and much cheaper to encode, and Atlas
+        Vector Search indexes it directly.
+        
+        Args:
+            embedding (List[float]): Embedding vector.
+            
+        Returns:
+            Any: A BSON vector Binary, or the list itself on older pymongo.
+        """
+        if BinaryVectorDtype is None:
+            return embedding
+        vector = embedding.tolist() if hasattr(embedding, "tolist") else embedding
+        return Binary.from_vector(vector, BinaryVectorDtype.FLOAT32)
+    
+    def _decode_memory_text(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Restore the "text" field of a memory document stored compressed.
+        
+        Args:
+            doc (Dict[str, Any]): Memory document read from MongoDB.
+            
+        Returns:
+            Dict[str, Any]: The same document with "text" populated.
+        """
+        compressed = doc.pop("text_zstd", None)
+        preview = doc.pop("text_preview", None)
+        if "text" in doc:
+            return doc
+        
+        if compressed is not None and zstandard is not None:
+            decompressor = getattr(self._zstd_local, "decompressor", None)
+            if decompressor is None:
+                decompressor = self._zstd_local.decompressor = zstandard.ZstdDecompressor()
+            doc["text"] = decompressor.decompress(bytes(compressed)).decode("utf-8")
+        else:
+            # zstandard missing on this reader; the preview is the best we have
+            doc["text"] = preview or ""
+        
+        return doc
     
     def search_memories(
         self, 
         query_text: str, 
         top_k: int = 5,
         vector_field_name: str = "embedding",
-        index_name: str = "vector_index_cosine"
+        index_name: str = "vector_index_cosine",
+        no_cache: bool = False,
+        num_candidates: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for relevant memories using vector search.
         
+        Results are cached for QUERY_CACHE_TTL seconds. A repeated query skips
+        both the embedding call and the search, and a query whose embedding is
+        within SEMANTIC_CACHE_THRESHOLD cosine similarity of a cached one skips
+        the search. If the vector index does not exist, the text-search fallback
+        is used instead; any other failure is raised to the caller.
+        
         Args:
             query_text (str): Query text to search for.
             top_k (int): Number of results to return.
             vector_field_name (str): Field name containing embeddings.
             index_name (str): Name of the vector search index.
+            no_cache (bool): Bypass the query cache and always search.
+            num_candidates (Optional[int]): Nearest-neighbour candidates considered by
+                $vectorSearch. Defaults to max(50, top_k * 4).
             
         Returns:
             List[Dict[str, Any]]: List of relevant memory documents with scores.
@@ -179,45 +756,329 @@ class MongoDBMemory:
         Raises:
             Exception: If embedding generation or database query fails.
         """
+        if num_candidates is None:
+            num_candidates = max(50, top_k * 4)
+        
+        cache_key = (query_text, top_k, vector_field_name, index_name, num_candidates)
+        generation = self._cache_generation
+        if not no_cache:
+            cached = self._get_cached_results(cache_key)
+            if cached is not None:
+                logger.debug("Using cached memories for: %.50s...", query_text)
+                return cached
+        
+        if time.monotonic() < self._vector_index_missing_until:
+            return self._fallback_text_search(query_text, top_k)
+        
         try:
             # Generate query embedding
-            print(f"Searching memories for: {query_text[:50]}...")
-            query_embedding = self.embedder.get_embedding(query_text, input_type="query")
+            logger.debug("Searching memories for: %.50s...", query_text)
+            query_embedding = self._unit_vector(
+                self.embedder.get_embedding(query_text, input_type="query")
+            )
             
-            # Construct MongoDB Atlas Vector Search aggregation pipeline
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": index_name,
-                        "path": vector_field_name,
-                        "queryVector": query_embedding,
-                        "numCandidates": top_k * 10,  # Number of candidates to consider
-                        "limit": top_k  # Number of results to return
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 0,
-                        "text": 1,
-                        "metadata": 1,
-                        "created_at": 1,
-                        "embedding_model": 1,
-                        "score": {"$meta": "vectorSearchScore"}
-                    }
-                }
-            ]
+            if not no_cache:
+                cached = self._get_similar_cached_results(cache_key, query_embedding)
+                if cached is not None:
+                    logger.debug("Using cached memories from a similar query")
+                    return cached
+            
+            results = self._vector_search(
+                query_embedding, top_k, vector_field_name, index_name, num_candidates
+            )
             
-            # Execute aggregation
-            results = list(self.collection.aggregate(pipeline))
-            print(f"Found {len(results)} relevant memories")
+            if not no_cache:
+                self._cache_results(cache_key, query_embedding, results, generation)
             
             return results
             
-        except Exception as e:
-            print(f"Error searching memories: {str(e)}")
-            # Fallback to text-based search if vector search fails
-            print("Falling back to text-based search...")
+        except OperationFailure as e:
+            # Fallback to text-based search only if the vector index is missing
+            if not self._note_missing_vector_index(e):
+                logger.error("Error searching memories: %s", e)
+                raise
             return self._fallback_text_search(query_text, top_k)
+        except Exception as e:
+            logger.error("Error searching memories: %s", e)
+            raise
+    
+    def _note_missing_vector_index(self, error: OperationFailure) -> bool:
+        """
+        Check whether a search failed because the vector index is missing, and
+        if so route searches to the text fallback for VECTOR_INDEX_RETRY_SECONDS.
+        
+        Args:
+            error (OperationFailure): Error raised by the $vectorSearch aggregation.
+            
+        Returns:
+            bool: True if the vector index is missing.
+        """
+        if error.code not in self.VECTOR_INDEX_MISSING_CODES:
+            return False
+        
+        self._vector_index_missing_until = time.monotonic() + self.VECTOR_INDEX_RETRY_SECONDS
+        logger.warning(
+            "Vector search index unavailable, using text-based search for %.0f seconds: %s",
+            self.VECTOR_INDEX_RETRY_SECONDS, error
+        )
+        return True
+    
+    async def asearch_memories_many(
+        self, 
+        queries: List[str], 
+        top_k: int = 5,
+        vector_field_name: str = "embedding",
+        index_name: str = "vector_index_cosine",
+        num_candidates: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search memories for several queries at once.
+        
+        All queries are embedded with one batched Voyage call, then their
+        $vectorSearch aggregations run concurrently on the pooled client. The
+        query cache is not consulted. As in search_memories, only a missing
+        vector index falls back to text search; other errors propagate.
+        
+        Args:
+            queries (List[str]): Query texts to search for.
+            top_k (int): Number of results to return per query.
+            vector_field_name (str): Field name containing embeddings.
+            index_name (str): Name of the vector search index.
+            num_candidates (Optional[int]): Nearest-neighbour candidates considered by
+                $vectorSearch. Defaults to max(50, top_k * 4).
+            
+        Returns:
+            List[List[Dict[str, Any]]]: Results for each query, in input order.
+        """
+        if not queries:
+            return []
+        if num_candidates is None:
+            num_candidates = max(50, top_k * 4)
+        
+        async def text_search(query_text: str) -> List[Dict[str, Any]]:
+            return await asyncio.to_thread(self._fallback_text_search, query_text, top_k)
+        
+        if time.monotonic() < self._vector_index_missing_until:
+            return list(await asyncio.gather(*(text_search(query_text) for query_text in queries)))
+        
+        logger.debug("Searching memories for %d queries...", len(queries))
+        embeddings = await self.embedder.aget_embeddings(queries, input_type="query")
+        embeddings = [self._unit_vector(embedding) for embedding in embeddings]
+        
+        async def vector_search(query_text: str, query_embedding: List[float]) -> List[Dict[str, Any]]:
+            try:
+                return await asyncio.to_thread(
+                    self._vector_search,
+                    query_embedding, top_k, vector_field_name, index_name, num_candidates
+                )
+            except OperationFailure as e:
+                if not self._note_missing_vector_index(e):
+                    raise
+                return await text_search(query_text)
+        
+        return list(await asyncio.gather(
+            *(vector_search(query_text, embedding) for query_text, embedding in zip(queries, embeddings))
+        ))
+    
+    def _vector_search(
+        self, 
+        query_embedding: List[float], 
+        top_k: int,
+        vector_field_name: str,
+        index_name: str,
+        num_candidates: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a $vectorSearch aggregation for an embedded query.
+        
+        Args:
+            query_embedding (List[float]): Embedding of the query.
+            top_k (int): Number of results to return.
+            vector_field_name (str): Field name containing embeddings.
+            index_name (str): Name of the vector search index.
+            num_candidates (int): Nearest-neighbour candidates to consider.
+            
+        Returns:
+            List[Dict[str, Any]]: Matching memory documents with scores.
+        """
+        # Construct MongoDB Atlas Vector Search aggregation pipeline
+        pipeline = [
+            {
+                "$vectorSearch": {
+                    "index": index_name,
+                    "path": vector_field_name,
+                    "queryVector": query_embedding,
+                    "numCandidates": num_candidates,  # Number of candidates to consider
+                    "limit": top_k,  # Number of results to return
+                    "exact": False  # Approximate (HNSW) search
+                }
+            },
+            self._SEARCH_PROJECT_STAGE
+        ]
+        
+        # Execute aggregation
+        results = [self._decode_memory_text(doc) for doc in self.collection.aggregate(pipeline)]
+        logger.debug("Found %d relevant memories", len(results))
+        return results
+    
+    def _get_cached_results(self, cache_key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get unexpired cached results for exactly the same search.
+        
+        Args:
+            cache_key (Tuple): (query_text, top_k, vector_field_name, index_name, num_candidates).
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached results, or None on a miss.
+        """
+        with self._query_cache_lock:
+            entry = self._query_cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[2] > self.QUERY_CACHE_TTL:
+                del self._query_cache[cache_key]
+                self._free_cache_slots.append(entry[0])
+                return None
+            self._query_cache.move_to_end(cache_key)
+            return list(entry[1])
+    
+    def _get_similar_cached_results(
+        self, 
+        cache_key: Tuple, 
+        query_embedding: List[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get unexpired cached results for a semantically near-identical search.
+        
+        Args:
+            cache_key (Tuple): (query_text, top_k, vector_field_name, index_name, num_candidates).
+            query_embedding (List[float]): Embedding of the new query.
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached results, or None on a miss.
+        """
+        now = time.monotonic()
+        with self._query_cache_lock:
+            # Only searches with the same top_k, field, index, and candidates are comparable
+            candidates = [
+                (key, entry) for key, entry in self._query_cache.items()
+                if key[1:] == cache_key[1:] and now - entry[2] <= self.QUERY_CACHE_TTL
+            ]
+            if not candidates or len(query_embedding) != self._cache_dim:
+                return None
+            
+            similarities = self._cached_similarities(query_embedding, [entry[0] for _, entry in candidates])
+            best = max(range(len(similarities)), key=similarities.__getitem__)
+            if similarities[best] < self.SEMANTIC_CACHE_THRESHOLD:
+                return None
+            
+            key, entry = candidates[best]
+            self._query_cache.move_to_end(key)
+            return list(entry[1])
+    
+    def _cache_results(
+        self, 
+        cache_key: Tuple, 
+        query_embedding: List[float], 
+        results: List[Dict[str, Any]],
+        generation: int
+    ) -> None:
+        """
+        Cache search results, evicting the least recently used entries.
+        
+        Results are dropped if a memory was written after the search started.
+        
+        Args:
+            cache_key (Tuple): (query_text, top_k, vector_field_name, index_name, num_candidates).
+            query_embedding (List[float]): Embedding of the query.
+            results (List[Dict[str, Any]]): Results returned by the search.
+            generation (int): Cache generation read before the search started.
+        """
+        with self._query_cache_lock:
+            if generation != self._cache_generation:
+                return
+            
+            if len(query_embedding) != self._cache_dim:
+                # First entry, or the embedding model changed: start over
+                self._reset_query_cache(len(query_embedding))
+            
+            entry = self._query_cache.pop(cache_key, None)
+            if entry is not None:
+                slot = entry[0]
+            elif self._free_cache_slots:
+                slot = self._free_cache_slots.pop()
+            else:
+                slot = self._query_cache.popitem(last=False)[1][0]
+            
+            self._store_cache_vector(slot, query_embedding)
+            self._query_cache[cache_key] = (slot, list(results), time.monotonic())
+    
+    def _invalidate_query_cache(self) -> None:
+        """
+        Empty the query cache after a write so searches see new memories.
+        """
+        with self._query_cache_lock:
+            self._cache_generation += 1
+            if self._query_cache:
+                self._free_cache_slots.extend(entry[0] for entry in self._query_cache.values())
+                self._query_cache.clear()
+    
+    def _reset_query_cache(self, dim: int) -> None:
+        """
+        Empty the query cache and allocate vector storage for embeddings of dim.
+        
+        Query embeddings are L2-normalized before they reach the cache, so
+        cosine similarity is a plain dot product. With numpy they live in one
+        preallocated float16 matrix (one row per slot) to halve memory traffic
+        during lookups.
+        
+        Args:
+            dim (int): Embedding dimension.
+        """
+        self._query_cache.clear()
+        self._free_cache_slots = list(range(self.QUERY_CACHE_SIZE - 1, -1, -1))
+        self._cache_dim = dim
+        if np is not None:
+            self._cache_vectors = np.zeros((self.QUERY_CACHE_SIZE, dim), dtype=np.float16)
+        else:
+            self._cache_vectors = [None] * self.QUERY_CACHE_SIZE
+    
+    def _store_cache_vector(self, slot: int, embedding: List[float]) -> None:
+        """
+        Store an L2-normalized embedding in a cache slot.
+        
+        Args:
+            slot (int): Row of the cache vector storage.
+            embedding (List[float]): L2-normalized query embedding.
+        """
+        self._cache_vectors[slot] = embedding
+    
+    def _cached_similarities(self, query_embedding: List[float], slots: List[int]) -> List[float]:
+        """
+        Compute the cosine similarity between a query and cached embeddings.
+        
+        Both sides are already unit length, so this is a dot product.
+        
+        Args:
+            query_embedding (List[float]): L2-normalized query embedding.
+            slots (List[int]): Cache slots to compare against.
+            
+        Returns:
+            List[float]: Similarity of each slot's embedding to the query.
+        """
+        if np is not None:
+            query = np.asarray(query_embedding, dtype=np.float16)
+            matrix = self._cache_vectors[slots]
+            if simsimd is not None:
+                # simsimd 3.x reports the inner product as a distance, 1 - dot
+                distances = np.asarray(simsimd.cdist(query[None, :], matrix, metric="inner"))
+                return (1.0 - distances.reshape(-1)).tolist()
+            return (matrix.astype(np.float32) @ query.astype(np.float32)).tolist()
+        
+        return [
+            sum(a * b for a, b in zip(query_embedding, self._cache_vectors[slot]))
+            for slot in slots
+        ]
     
     def _fallback_text_search(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
@@ -231,37 +1092,19 @@ class MongoDBMemory:
             List[Dict[str, Any]]: List of relevant memory documents.
         """
         try:
-            # Simple text search using MongoDB text search
-            # First, ensure text index exists
-            try:
-                self.collection.create_index([("text", "text")])
-            except:
-                pass  # Index might already exist
-            
-            # Perform text search
-            results = list(
-                self.collection
-                .find({"$text": {"$search": query_text}})
-                .limit(top_k)
-                .sort([("score", {"$meta": "textScore"})])
-            )
-            
-            # Format results to match vector search format
-            formatted_results = []
-            for result in results:
-                formatted_result = {
-                    "text": result.get("text", ""),
-                    "metadata": result.get("metadata", {}),
-                    "created_at": result.get("created_at"),
-                    "embedding_model": result.get("embedding_model"),
-                    "score": result.get("score", 0.5)  # Default score for text search
-                }
-                formatted_results.append(formatted_result)
+            # Simple text search using MongoDB text search (index created in __init__),
+            # shaped server-side to match the vector search results
+            pipeline = [
+                {"$match": {"$text": {"$search": query_text}}},
+                self._TEXT_SEARCH_SORT_STAGE,
+                {"$limit": top_k},
+                self._TEXT_SEARCH_PROJECT_STAGE
+            ]
             
-            return formatted_results
+            return [self._decode_memory_text(doc) for doc in self.collection.aggregate(pipeline)]
             
         except Exception as e:
-            print(f"Fallback text search also failed: {str(e)}")
+            logger.error("Fallback text search also failed: %s", e)
             return []
     
     def format_memories_for_prompt(self, search_results: List[Dict[str, Any]]) -> str:
@@ -277,67 +1120,96 @@ class MongoDBMemory:
         if not search_results:
             return "No relevant memories found."
         
-        formatted_memories = ["Relevant memories:"]
+        buf = io.StringIO()
+        buf.write("Relevant memories:")
         
         for i, memory in enumerate(search_results, 1):
             text = memory.get("text", "")
             score = memory.get("score", 0)
-            metadata = memory.get("metadata", {})
-            source = metadata.get("source", "unknown")
+            source = memory.get("metadata", {}).get("source", "unknown")
             
-            memory_entry = f"{i}. [Score: {score:.3f}] [Source: {source}] {text}"
-            formatted_memories.append(memory_entry)
+            buf.write(f"\n{i}. [Score: {score:.3f}] [Source: {source}] {text}")
         
-        return "\n".join(formatted_memories)
+        return buf.getvalue()
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the memory collection.
         
         Returns:
-            Dict[str, Any]: Statistics including count, latest entry, etc.
+            Dict[str, Any]: Statistics including count, latest entry, etc. The total
+                is estimated from collection metadata; use exact_count for an exact
+                or filtered count.
         """
         try:
-            total_count = self.collection.count_documents({})
+            # Collection metadata gives the total without scanning documents
+            total_count = self.collection.estimated_document_count()
             
-            # Get latest memory
-            latest_memory = self.collection.find_one(
-                {}, 
-                sort=[("created_at", -1)]
-            )
-            
-            # Get memory sources breakdown
-            pipeline = [
-                {"$group": {
-                    "_id": "$metadata.source",
-                    "count": {"$sum": 1}
-                }}
-            ]
-            sources = list(self.collection.aggregate(pipeline))
+            # A plain sorted find can walk the created_at index; a $sort inside
+            # $facet cannot
+            latest = self.collection.find_one({}, {"created_at": 1}, sort=[("created_at", -1)])
+            sources = self.collection.aggregate(self._SOURCES_PIPELINE)
             
             stats = {
                 "total_memories": total_count,
-                "latest_memory_date": latest_memory.get("created_at") if latest_memory else None,
+                "latest_memory_date": latest.get("created_at") if latest else None,
                 "sources_breakdown": {source["_id"] or "unknown": source["count"] for source in sources}
             }
             
             return stats
             
         except Exception as e:
-            print(f"Error getting memory stats: {str(e)}")
+            logger.error("Error getting memory stats: %s", e)
             return {"error": str(e)}
     
+    def exact_count(self, filter: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count the memories matching a filter exactly.
+        
+        Args:
+            filter (Optional[Dict[str, Any]]): MongoDB query filter. Counts all memories if None.
+            
+        Returns:
+            int: Number of matching memories.
+        """
+        return self.collection.count_documents(filter or {})
+    
     def close(self):
         """Close the MongoDB connection."""
+        if getattr(self, '_owns_embedder', False):
+            self.embedder.close()
         if hasattr(self, 'client'):
             self.client.close()
-            print("MongoDB connection closed")
+            logger.info("MongoDB connection closed")
+
+
+# Process-wide MongoDBMemory shared by all callers
+_memory_singleton: Optional[MongoDBMemory] = None
+
+
+def get_mongo_memory() -> MongoDBMemory:
+    """
+    Get the shared MongoDBMemory instance, creating it on first use.
+    
+    Reusing one instance shares the MongoDB driver's connection pool across
+    callers. The connection is closed when the process exits.
+    
+    Returns:
+        MongoDBMemory: The shared memory instance.
+    """
+    global _memory_singleton
+    if _memory_singleton is None:
+        _memory_singleton = MongoDBMemory()
+        atexit.register(_memory_singleton.close)
+    return _memory_singleton
 
 
 if __name__ == "__main__":
     """
     Example usage and testing of MongoDBMemory.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         # Initialize MongoDB memory
         mongo_memory = MongoDBMemory()
@@ -362,10 +1234,10 @@ if __name__ == "__main__":
         ]
         
         print("\nAdding sample memories...")
-        memory_ids = []
-        for memory in sample_memories:
-            memory_id = mongo_memory.add_memory(memory["text"], memory["metadata"])
-            memory_ids.append(memory_id)
+        memory_ids = mongo_memory.add_memories(
+            [memory["text"] for memory in sample_memories],
+            [memory["metadata"] for memory in sample_memories]
+        )
         
         # Test search functionality
         print("\nTesting memory search...")
@@ -380,7 +1252,10 @@ if __name__ == "__main__":
         # Get memory statistics
         print("\nMemory statistics:")
         stats = mongo_memory.get_memory_stats()
-        print(json.dumps(stats, indent=2, default=str))
+        if orjson is not None:
+            print(orjson.dumps(stats, default=str, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        else:
+            print(json.dumps(stats, indent=2, default=str))
         
         print("\nMongoDBMemory testing completed successfully!")
         
@@ -5,13 +5,55 @@ This module provides Tavily search functionality with performance tracking
 for enhancing agent research capabilities.
 """
 
+import io
 import os
 import time
 import json
-import requests
+import asyncio
+import logging
+import threading
+import collections
+import httpx
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
 
+# orjson is an optional speedup; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-call progress is logged at DEBUG; the default WARNING level keeps the
+# hot path quiet
+logger = logging.getLogger(__name__)
+
+# Load .env once per process rather than on every instantiation
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time this is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_ensure_env()
+
+# Maximum characters of each result's content included for the agent
+TRUNCATE = 300
+
+
+def _json_dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request payload to JSON bytes."""
+    return orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(content: bytes) -> Any:
+    """Parse a JSON response body."""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
 
 class TavilySearchTool:
     """
@@ -21,6 +63,9 @@ class TavilySearchTool:
     for agent consumption.
     """
     
+    # Number of recent searches kept for performance tracking
+    RECENT_QUERIES_LIMIT = 1024
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the TavilySearchTool.
@@ -31,9 +76,6 @@ class TavilySearchTool:
         Raises:
             ValueError: If API key is not provided and not found in environment.
         """
-        # Load environment variables
-        load_dotenv()
-        
         # Get API key
         self.api_key = api_key or os.getenv("TAVILY_API_KEY")
         if not self.api_key:
@@ -49,10 +91,30 @@ class TavilySearchTool:
             "Content-Type": "application/json"
         }
         
-        # Query patterns for optimization tracking (advanced feature)
-        self.query_patterns = {}
+        # Reuse one pooled HTTP/2 connection across all Tavily requests
+        self._client_options = {
+            "http2": True,
+            "headers": self.headers,
+            "timeout": 30.0,  # 30 second timeout
+            "limits": httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        }
+        self._client = httpx.Client(**self._client_options)
+        
+        # Created on first asearch, inside the running event loop
+        self._async_client = None
         
-        print("TavilySearchTool initialized successfully")
+        # Query patterns for optimization tracking (advanced feature): the most
+        # recent searches plus running totals, so memory use stays bounded and
+        # get_performance_stats does not rescan the history
+        self._recent = collections.deque(maxlen=self.RECENT_QUERIES_LIMIT)
+        self._stats_lock = threading.Lock()
+        self._n = 0
+        self._sum_dur = 0.0
+        self._min_dur = float("inf")
+        self._max_dur = 0.0
+        self._sum_results = 0
+        
+        logger.info("TavilySearchTool initialized successfully")
     
     def search(
         self,
@@ -99,60 +161,195 @@ class TavilySearchTool:
         
         try:
             # Prepare payload
-            payload = {
-                "query": query,
-                "topic": topic,
-                "search_depth": search_depth,
-                "chunks_per_source": chunks_per_source,
-                "max_results": max_results,
-                "time_range": time_range,
-                "days": days,
-                "include_answer": include_answer,
-                "include_raw_content": include_raw_content,
-                "include_images": include_images,
-                "include_image_descriptions": include_image_descriptions,
-                "include_domains": include_domains or [],
-                "exclude_domains": exclude_domains or []
-            }
+            payload = self._build_search_payload(
+                query, topic, search_depth, chunks_per_source, max_results, time_range,
+                days, include_answer, include_raw_content, include_images,
+                include_image_descriptions, include_domains, exclude_domains
+            )
             
-            print(f"Performing Tavily search for: {query[:50]}...")
+            logger.debug("Performing Tavily search for: %.50s...", query)
             
             # Make API request
-            response = requests.post(
-                self.search_url,
-                json=payload,
-                headers=self.headers,
-                timeout=30  # 30 second timeout
-            )
+            response = self._client.post(self.search_url, content=_json_dumps(payload))
             
             # Check response status
             response.raise_for_status()
             
             # Parse response
-            search_results = response.json()
+            search_results = _json_loads(response.content)
             
-            # Performance tracking end
-            end_time = time.time()
-            duration = end_time - start_time
+            self._record_search(query, start_time, search_results)
+            return search_results
             
-            print(f"Tavily search for '{query}' completed in {duration:.2f} seconds")
+        except httpx.HTTPError as e:
+            logger.error("Error during Tavily search: %s", e)
+            raise Exception(f"Tavily API request failed: {str(e)}")
+        except Exception as e:
+            logger.error("Unexpected error during search: %s", e)
+            raise
+    
+    async def asearch(
+        self,
+        query: str,
+        topic: str = "general",
+        search_depth: str = "basic",
+        chunks_per_source: int = 3,
+        max_results: int = 5,
+        time_range: Optional[str] = None,
+        days: int = 7,
+        include_answer: bool = True,
+        include_raw_content: bool = False,
+        include_images: bool = False,
+        include_image_descriptions: bool = False,
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform a web search using Tavily API without blocking the event loop.
+        
+        Takes the same arguments as search. All calls must come from the same
+        event loop, since the underlying async client is bound to it.
+        
+        Returns:
+            Dict[str, Any]: Search results from Tavily API.
             
-            # Store query patterns for optimization tracking
-            self.query_patterns[query] = {
-                "duration": duration,
-                "results_count": len(search_results.get("results", [])),
-                "timestamp": time.time()
-            }
+        Raises:
+            Exception: If API request fails.
+        """
+        # Performance tracking start
+        start_time = time.time()
+        
+        try:
+            # Prepare payload
+            payload = self._build_search_payload(
+                query, topic, search_depth, chunks_per_source, max_results, time_range,
+                days, include_answer, include_raw_content, include_images,
+                include_image_descriptions, include_domains, exclude_domains
+            )
+            
+            logger.debug("Performing Tavily search for: %.50s...", query)
+            
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(**self._client_options)
+            
+            # Make API request
+            response = await self._async_client.post(self.search_url, content=_json_dumps(payload))
+            
+            # Check response status
+            response.raise_for_status()
+            
+            # Parse response
+            search_results = _json_loads(response.content)
             
+            self._record_search(query, start_time, search_results)
             return search_results
             
-        except requests.exceptions.RequestException as e:
-            print(f"Error during Tavily search: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error during Tavily search: %s", e)
             raise Exception(f"Tavily API request failed: {str(e)}")
         except Exception as e:
-            print(f"Unexpected error during search: {str(e)}")
+            logger.error("Unexpected error during search: %s", e)
             raise
     
+    async def search_many(
+        self,
+        queries: List[str],
+        max_concurrency: int = 16,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several Tavily searches concurrently.
+        
+        Args:
+            queries (List[str]): The search query strings.
+            max_concurrency (int): Maximum number of requests in flight, to stay
+                within Tavily rate limits.
+            **kwargs: Additional search parameters, as accepted by search.
+            
+        Returns:
+            List[Dict[str, Any]]: Search results in the same order as queries. A
+                failed search yields {"query", "error", "results": []} instead.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_search(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.asearch(query, **kwargs)
+        
+        outcomes = await asyncio.gather(
+            *(bounded_search(query) for query in queries),
+            return_exceptions=True
+        )
+        
+        return [
+            {"query": query, "error": str(outcome), "results": []}
+            if isinstance(outcome, Exception) else outcome
+            for query, outcome in zip(queries, outcomes)
+        ]
+    
+    def _build_search_payload(
+        self,
+        query: str,
+        topic: str,
+        search_depth: str,
+        chunks_per_source: int,
+        max_results: int,
+        time_range: Optional[str],
+        days: int,
+        include_answer: bool,
+        include_raw_content: bool,
+        include_images: bool,
+        include_image_descriptions: bool,
+        include_domains: Optional[List[str]],
+        exclude_domains: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Build the request body for a Tavily search.
+        
+        Returns:
+            Dict[str, Any]: JSON payload for the search endpoint.
+        """
+        return {
+            "query": query,
+            "topic": topic,
+            "search_depth": search_depth,
+            "chunks_per_source": chunks_per_source,
+            "max_results": max_results,
+            "time_range": time_range,
+            "days": days,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+            "include_image_descriptions": include_image_descriptions,
+            "include_domains": include_domains or [],
+            "exclude_domains": exclude_domains or []
+        }
+    
+    def _record_search(self, query: str, start_time: float, search_results: Dict[str, Any]) -> None:
+        """
+        Log a completed search and store its query pattern.
+        
+        Args:
+            query (str): The search query string.
+            start_time (float): time.time() when the search started.
+            search_results (Dict[str, Any]): Search results from Tavily API.
+        """
+        # Performance tracking end
+        end_time = time.time()
+        duration = end_time - start_time
+        
+        logger.debug("Tavily search for '%s' completed in %.2f seconds", query, duration)
+        
+        # Store query patterns for optimization tracking
+        results_count = len(search_results.get("results", []))
+        with self._stats_lock:
+            self._recent.append((query, duration, results_count, end_time))
+            self._n += 1
+            self._sum_dur += duration
+            self._min_dur = min(self._min_dur, duration)
+            self._max_dur = max(self._max_dur, duration)
+            self._sum_results += results_count
+    
     def extract_content(
         self,
         urls: str,
@@ -181,31 +378,26 @@ class TavilySearchTool:
                 "extract_depth": extract_depth
             }
             
-            print(f"Extracting content from: {urls[:100]}...")
+            logger.debug("Extracting content from: %.100s...", urls)
             
             # Make API request
-            response = requests.post(
-                self.extract_url,
-                json=payload,
-                headers=self.headers,
-                timeout=30
-            )
+            response = self._client.post(self.extract_url, content=_json_dumps(payload))
             
             # Check response status
             response.raise_for_status()
             
             # Parse response
-            extraction_results = response.json()
+            extraction_results = _json_loads(response.content)
             
-            print("Content extraction completed successfully")
+            logger.debug("Content extraction completed successfully")
             
             return extraction_results
             
-        except requests.exceptions.RequestException as e:
-            print(f"Error during content extraction: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error during content extraction: %s", e)
             raise Exception(f"Tavily extraction API request failed: {str(e)}")
         except Exception as e:
-            print(f"Unexpected error during extraction: {str(e)}")
+            logger.error("Unexpected error during extraction: %s", e)
             raise
     
     def format_results_for_agent(self, tavily_response: Dict[str, Any]) -> str:
@@ -221,12 +413,12 @@ class TavilySearchTool:
         if not tavily_response:
             return "No search results available."
         
-        formatted_result = ["Search Results:"]
+        buf = io.StringIO()
+        buf.write("Search Results:")
         
         # Include direct answer if available
         if tavily_response.get("answer"):
-            formatted_result.append(f"\nDirect Answer: {tavily_response['answer']}")
-            formatted_result.append("")  # Empty line for spacing
+            buf.write(f"\n\nDirect Answer: {tavily_response['answer']}\n")
         
         # Format search results
         results = tavily_response.get("results", [])
@@ -237,15 +429,14 @@ class TavilySearchTool:
                 content = result.get("content", "No content available")
                 
                 # Truncate content if too long
-                if len(content) > 300:
-                    content = content[:300] + "..."
+                if len(content) > TRUNCATE:
+                    content = f"{content[:TRUNCATE]}..."
                 
-                result_entry = f"{i}. **{title}**\n   URL: {url}\n   Content: {content}\n"
-                formatted_result.append(result_entry)
+                buf.write(f"\n{i}. **{title}**\n   URL: {url}\n   Content: {content}\n")
         else:
-            formatted_result.append("No specific results found.")
+            buf.write("\nNo specific results found.")
         
-        return "\n".join(formatted_result)
+        return buf.getvalue()
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """
@@ -254,23 +445,31 @@ class TavilySearchTool:
         Returns:
             Dict[str, Any]: Performance statistics.
         """
-        if not self.query_patterns:
-            return {"message": "No search queries performed yet"}
-        
-        durations = [pattern["duration"] for pattern in self.query_patterns.values()]
-        result_counts = [pattern["results_count"] for pattern in self.query_patterns.values()]
-        
-        stats = {
-            "total_queries": len(self.query_patterns),
-            "average_duration": sum(durations) / len(durations),
-            "fastest_query": min(durations),
-            "slowest_query": max(durations),
-            "average_results_per_query": sum(result_counts) / len(result_counts) if result_counts else 0,
-            "recent_queries": list(self.query_patterns.keys())[-5:]  # Last 5 queries
-        }
+        with self._stats_lock:
+            if not self._n:
+                return {"message": "No search queries performed yet"}
+            
+            stats = {
+                "total_queries": self._n,
+                "average_duration": self._sum_dur / self._n,
+                "fastest_query": self._min_dur,
+                "slowest_query": self._max_dur,
+                "average_results_per_query": self._sum_results / self._n,
+                "recent_queries": [record[0] for record in list(self._recent)[-5:]]  # Last 5 queries
+            }
         
         return stats
     
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self._client.close()
+    
+    async def aclose(self):
+        """Close the pooled async HTTP connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
     def mock_search(self, query: str, **kwargs) -> Dict[str, Any]:
         """
         Mock search for testing without API calls.
@@ -306,7 +505,7 @@ class TavilySearchTool:
             ]
         }
         
-        print(f"Mock search performed for: {query}")
+        logger.debug("Mock search performed for: %s", query)
         return mock_response
 
 
@@ -314,6 +513,8 @@ if __name__ == "__main__":
     """
     Example usage and testing of TavilySearchTool.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         # Initialize Tavily search tool
         tavily_tool = TavilySearchTool()
@@ -338,7 +539,10 @@ if __name__ == "__main__":
         # Show performance stats
         print("\nPerformance statistics:")
         stats = tavily_tool.get_performance_stats()
-        print(json.dumps(stats, indent=2))
+        if orjson is not None:
+            print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        else:
+            print(json.dumps(stats, indent=2))
         
         # Test mock search
         print("\nTesting mock search...")
@@ -352,3 +556,8 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error during testing: {str(e)}")
         print("Make sure TAVILY_API_KEY is set in your .env file")
+    
+    finally:
+        # Close connections
+        if 'tavily_tool' in locals():
+            tavily_tool.close()
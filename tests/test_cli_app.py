@@ -0,0 +1,38 @@
+import queue
+from concurrent.futures import Future
+
+import pytest
+
+cli_app = pytest.importorskip("cli_app")
+
+SleepChatSession = cli_app.SleepChatSession
+
+MEMORY_HITS = [{"text": "a", "score": 0.2}, {"text": "b", "score": 0.1}, {"text": "c", "score": 0.1}]
+
+
+@pytest.mark.parametrize("query", ["latest release notes", "what happened today", "recent news on mongo"])
+def test_trigger_words_search_web_even_with_memory_hits(query):
+    session = SleepChatSession.__new__(SleepChatSession)
+    assert session.needs_web_search(query, MEMORY_HITS)
+
+
+def test_memory_hits_without_triggers_skip_web_search():
+    session = SleepChatSession.__new__(SleepChatSession)
+    assert not session.needs_web_search("explain my earlier notes", MEMORY_HITS)
+
+
+def test_question_without_memory_hits_searches_web():
+    session = SleepChatSession.__new__(SleepChatSession)
+    assert session.needs_web_search("what is a vector index", [])
+
+
+def test_speculative_search_result_is_used():
+    session = SleepChatSession.__new__(SleepChatSession)
+    session.web_searches = 0
+    session._meta_web = {}
+    session._write_q = queue.Queue()
+    pending = Future()
+    pending.set_result("fresh results")
+
+    assert session.search_web_if_needed("latest release notes", MEMORY_HITS, pending) == "fresh results"
+    assert session.web_searches == 1
@@ -0,0 +1,72 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+memory_sync = pytest.importorskip("memory_sync")
+
+
+class FakeMongoMemory:
+    def __init__(self):
+        self.writes = []
+        self.core_written = threading.Event()
+
+    def add_memories_bulk(self, items, dedupe=False):
+        self.writes.append([text for text, _ in items])
+        if any(text == "core block" for text, _ in items):
+            self.core_written.set()
+        return len(items)
+
+    def get_memory_stats(self):
+        return {}
+
+
+class FakeSynchronizer:
+    agent_type = "sleep"
+
+    def __init__(self):
+        self.mongo_memory = FakeMongoMemory()
+        self.agent_id = "agent"
+
+    def get_sleep_agent_memories(self):
+        return []
+
+    def collect_core_memory(self):
+        return [("core block", {"source": "core_memory"})]
+
+    def collect_sleep_agent_state(self):
+        return [("Agent name: test", {"source": "agent_state"})]
+
+    def sync_chat_history(self):
+        # Core memory must be stored while chat history is still syncing
+        assert self.mongo_memory.core_written.wait(timeout=5)
+        return self.mongo_memory.add_memories_bulk([("hello", {"source": "chat_history"})], dedupe=True)
+
+    def get_sync_statistics(self):
+        return {}
+
+
+def test_core_and_state_are_written_together_alongside_chat(monkeypatch):
+    created = []
+
+    def make_synchronizer():
+        created.append(FakeSynchronizer())
+        return created[-1]
+
+    monkeypatch.setattr(memory_sync, "SleepMemorySynchronizer", make_synchronizer)
+
+    assert memory_sync.sync_sleep_memories() is True
+    writes = created[0].mongo_memory.writes
+    assert sorted(writes) == [["core block", "Agent name: test"], ["hello"]]
+
+
+def test_repeated_chat_text_is_kept():
+    synchronizer = memory_sync.SleepMemorySynchronizer.__new__(memory_sync.SleepMemorySynchronizer)
+    synchronizer.agent_id = "agent"
+    synchronizer.group_id = None
+    synchronizer._seen_hashes = set()
+    messages = [SimpleNamespace(id=f"m{i}", text="thanks", role="user") for i in range(2)]
+
+    pending = synchronizer._collect_chat_messages(messages)
+
+    assert [metadata["message_id"] for _, metadata in pending] == ["m0", "m1"]
@@ -0,0 +1,158 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo import MongoClient
+from pymongo.synchronous.bulk import _Bulk
+from pymongo.write_concern import WriteConcern
+
+import mongodb_memory
+from mongodb_memory import MongoDBMemory
+
+
+def _offline_memory(fast_insert: bool = True) -> MongoDBMemory:
+    """A MongoDBMemory wired to a client that never connects."""
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory.client = MongoClient("mongodb://localhost:1", connect=False)
+    memory.collection = memory.client["toolmemory"]["memories"]
+    memory._write_collection = (
+        memory.collection.with_options(write_concern=WriteConcern(w=0))
+        if fast_insert else memory.collection
+    )
+    memory.embedder = SimpleNamespace(model="voyage-code-2")
+    memory._zstd_local = threading.local()
+    memory._embed_documents = lambda texts: [[1.0, 0.0, 0.0] for _ in texts]
+    memory._query_cache = OrderedDict()
+    memory._query_cache_lock = threading.Lock()
+    memory._cache_generation = 0
+    memory._free_cache_slots = []
+    return memory
+
+
+def test_add_memories_passes_pymongo_unacknowledged_write_checks(monkeypatch):
+    memory = _offline_memory(fast_insert=True)
+    sent = []
+
+    @contextmanager
+    def fake_conn_for_writes(session, operation):
+        yield SimpleNamespace(max_wire_version=21)
+
+    # Stop right after pymongo's own w=0 argument validation
+    monkeypatch.setattr(memory.client, "_conn_for_writes", fake_conn_for_writes)
+    monkeypatch.setattr(_Bulk, "execute_op_msg_no_results", lambda self, conn, gen: sent.extend(gen))
+
+    inserted_ids = memory.add_memories(["first memory", "second memory"])
+
+    assert len(inserted_ids) == 2
+    assert sum(len(run.ops) for run in sent) == 2
+    memory.client.close()
+
+
+@pytest.mark.parametrize("use_simsimd", [True, False])
+def test_cached_similarities_match_dot_product(monkeypatch, use_simsimd):
+    np = pytest.importorskip("numpy")
+    if use_simsimd:
+        pytest.importorskip("simsimd")
+    else:
+        monkeypatch.setattr(mongodb_memory, "simsimd", None)
+
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory._query_cache = OrderedDict()
+    memory._reset_query_cache(4)
+    cached = [MongoDBMemory._unit_vector(v) for v in ([1, 0, 0, 0], [1, 1, 0, 0], [0, 0, 1, 0])]
+    for slot, vector in enumerate(cached):
+        memory._store_cache_vector(slot, vector)
+
+    query = MongoDBMemory._unit_vector([1, 0.5, 0, 0])
+    similarities = memory._cached_similarities(query, [0, 1, 2])
+
+    expected = np.asarray(cached) @ np.asarray(query)
+    assert np.allclose(similarities, expected, atol=1e-2)
+
+
+def test_writes_invalidate_query_cache():
+    memory = _offline_memory()
+    memory._reset_query_cache(4)
+    cache_key = ("query", 5, "embedding", "vector_index_cosine", 50)
+    query = MongoDBMemory._unit_vector([1, 0, 0, 0])
+
+    memory._cache_results(cache_key, query, [{"text": "old"}], memory._cache_generation)
+    stale_generation = memory._cache_generation
+    memory._invalidate_query_cache()
+
+    assert memory._get_cached_results(cache_key) is None
+    # A search that started before the write must not repopulate the cache
+    memory._cache_results(cache_key, query, [{"text": "old"}], stale_generation)
+    assert memory._get_cached_results(cache_key) is None
+    memory._cache_results(cache_key, query, [{"text": "new"}], memory._cache_generation)
+    assert memory._get_cached_results(cache_key) == [{"text": "new"}]
+
+
+class FakeIndexCollection:
+    def __init__(self, indexes, failing=()):
+        self.indexes = dict(indexes)
+        self.failing = failing
+        self.created = []
+        self.dropped = []
+
+    def create_index(self, keys, **options):
+        if keys in self.failing:
+            raise RuntimeError("index build failed")
+        self.created.append(keys)
+
+    def index_information(self):
+        return self.indexes
+
+    def drop_index(self, name):
+        self.dropped.append(name)
+
+
+def test_ensure_indexes_replaces_legacy_text_index():
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory.collection = FakeIndexCollection({
+        "_id_": {"key": [("_id", 1)]},
+        "text_text": {"key": [("_fts", "text"), ("_ftsx", 1)], "weights": {"text": 1}}
+    })
+
+    memory._ensure_indexes()
+
+    assert memory.collection.dropped == ["text_text"]
+    assert [("text", "text"), ("text_preview", "text")] in memory.collection.created
+
+
+def test_ensure_indexes_keeps_current_text_index():
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory.collection = FakeIndexCollection({
+        "text_text_text_preview_text": {
+            "key": [("_fts", "text"), ("_ftsx", 1)],
+            "weights": {"text": 1, "text_preview": 1}
+        }
+    })
+
+    memory._ensure_indexes()
+
+    assert memory.collection.dropped == []
+    assert all(keys[0][1] != "text" for keys in memory.collection.created if isinstance(keys, list))
+
+
+def test_ensure_indexes_continues_after_a_failure():
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory.collection = FakeIndexCollection({}, failing=("_content_hash",))
+
+    memory._ensure_indexes()
+
+    assert [("created_at", -1)] in memory.collection.created
+    assert [("metadata.source", 1)] in memory.collection.created
+    assert [("text", "text"), ("text_preview", "text")] in memory.collection.created
+
+
+def test_content_hash_is_scoped_to_source_and_agent():
+    base = MongoDBMemory.content_hash("yes", "letta_sleep_core_memory", "agent-1")
+    assert base == MongoDBMemory.content_hash("yes", "letta_sleep_core_memory", "agent-1")
+    assert base != MongoDBMemory.content_hash("yes", "letta_sleep_agent_state", "agent-1")
+    assert base != MongoDBMemory.content_hash("yes", "letta_sleep_core_memory", "agent-2")
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+voyageai = pytest.importorskip("voyageai")
+
+import voyage
+from voyage import VoyageEmbedder
+
+
+class FlakyClient:
+    """Raises real Voyage rate limit errors before succeeding."""
+
+    def __init__(self, failures: int, retry_after: str = None):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def _attempt(self, texts):
+        self.calls += 1
+        if self.calls <= self.failures:
+            headers = {"Retry-After": self.retry_after} if self.retry_after else None
+            raise voyageai.error.RateLimitError("rate limited", http_status=429, headers=headers)
+        return SimpleNamespace(embeddings=[[float(len(text))] for text in texts])
+
+    def embed(self, texts, model, input_type):
+        return self._attempt(texts)
+
+
+class AsyncFlakyClient(FlakyClient):
+    async def embed(self, texts, model, input_type):
+        return self._attempt(texts)
+
+
+def test_rate_limit_retries_honor_retry_after(monkeypatch):
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder.client = FlakyClient(failures=2, retry_after="0.25")
+    sleeps = []
+    monkeypatch.setattr(voyage.time, "sleep", sleeps.append)
+
+    assert embedder.get_embeddings(["abc"]) == [[3.0]]
+    assert embedder.client.calls == 3
+    assert sleeps == [0.25, 0.25]
+
+
+def test_rate_limit_retries_use_bounded_jitter(monkeypatch):
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder.client = FlakyClient(failures=2)
+    sleeps = []
+    monkeypatch.setattr(voyage.time, "sleep", sleeps.append)
+
+    assert embedder.get_embeddings(["ab"]) == [[2.0]]
+    assert len(sleeps) == 2
+    assert all(embedder.RETRY_BASE_DELAY <= delay <= embedder.RETRY_MAX_DELAY for delay in sleeps)
+
+
+def test_rate_limit_error_is_raised_after_retries(monkeypatch):
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder.client = FlakyClient(failures=10)
+    monkeypatch.setattr(voyage.time, "sleep", lambda delay: None)
+
+    with pytest.raises(voyageai.error.RateLimitError):
+        embedder.get_embeddings(["ab"])
+    assert embedder.client.calls == 3
+
+
+def test_async_rate_limit_retries(monkeypatch):
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder._async_client = AsyncFlakyClient(failures=1, retry_after="0")
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(voyage.asyncio, "sleep", no_sleep)
+    assert asyncio.run(embedder.aget_embeddings(["abcd"])) == [[4.0]]
+    assert embedder._async_client.calls == 2
+
+
+class CountingAsyncClient:
+    def __init__(self, block: bool = False):
+        self.requests = []
+        self.block = block
+
+    async def embed(self, texts, model, input_type):
+        self.requests.append(list(texts))
+        if self.block:
+            await asyncio.Event().wait()
+        return SimpleNamespace(embeddings=[[float(len(text))] for text in texts])
+
+
+def test_concurrent_aget_embedding_calls_share_one_request():
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder._async_client = CountingAsyncClient()
+
+    async def run():
+        results = await asyncio.gather(*(embedder.aget_embedding(text) for text in ["a", "bb", "ccc"]))
+        await embedder.aclose()
+        return results
+
+    assert asyncio.run(run()) == [[1.0], [2.0], [3.0]]
+    assert len(embedder._async_client.requests) == 1
+    assert not embedder._batch_tasks
+
+
+def test_aclose_cancels_waiting_callers():
+    embedder = VoyageEmbedder(api_key="test-key", cache_path=None)
+    embedder._async_client = CountingAsyncClient(block=True)
+
+    async def run():
+        callers = [asyncio.ensure_future(embedder.aget_embedding(text)) for text in ["a", "b"]]
+        while not embedder._async_client.requests:
+            await asyncio.sleep(0.001)
+        assert embedder._batch_tasks
+        await embedder.aclose()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+@pytest.mark.parametrize("model, limit", [("voyage-code-2", 32000), ("voyage-2", 12000)])
+def test_memory_layer_truncates_with_the_embedder_limit(model, limit):
+    from mongodb_memory import MongoDBMemory
+
+    embedder = VoyageEmbedder(api_key="test-key", model=model, cache_path=None)
+    sent = []
+    embedder.client = SimpleNamespace(
+        embed=lambda texts, model, input_type: sent.extend(texts) or SimpleNamespace(embeddings=[[0.0]] * len(texts))
+    )
+    memory = MongoDBMemory.__new__(MongoDBMemory)
+    memory.embedder = embedder
+
+    memory._embed_documents(["x" * (limit * 2)])
+
+    assert embedder.max_text_chars == limit
+    assert [len(text) for text in sent] == [limit]
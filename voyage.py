@@ -6,10 +6,214 @@ This module provides a wrapper for the Voyage AI embedding API.
 
 import os
 import time
-from typing import List, Union, Optional
+import logging
+import random
+import asyncio
+import hashlib
+import sqlite3
+import functools
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Union, Optional
 from dotenv import load_dotenv
 import voyageai
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-call progress is logged at DEBUG; the default WARNING level keeps the
+# hot path quiet
+logger = logging.getLogger(__name__)
+
+# Load .env once per process rather than on every instantiation
+_ENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load environment variables from .env the first time this is called."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+_ensure_env()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str) -> "voyageai.Client":
+    """
+    Get the process-wide Voyage client for an API key.
+    
+    Embedders sharing a key share one client and its connection pool, so new
+    instances do not pay for fresh TCP and TLS handshakes.
+    
+    Args:
+        api_key (str): Voyage AI API key.
+        
+    Returns:
+        voyageai.Client: The shared client.
+    """
+    return voyageai.Client(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_async_client(api_key: str) -> "voyageai.AsyncClient":
+    """
+    Get the process-wide async Voyage client for an API key.
+    
+    Args:
+        api_key (str): Voyage AI API key.
+        
+    Returns:
+        voyageai.AsyncClient: The shared client.
+    """
+    return voyageai.AsyncClient(api_key=api_key)
+
+
+def quantize_int8(embedding: List[float]) -> Tuple[bytes, float]:
+    """
+    Symmetrically quantize an embedding to int8 with a per-vector scale.
+    
+    Args:
+        embedding (List[float]): Embedding vector.
+        
+    Returns:
+        Tuple[bytes, float]: The packed int8 values and the scale that
+        dequantize_int8 multiplies them by.
+    """
+    if np is not None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        scale = float(np.max(np.abs(vector))) / 127.0 or 1.0
+        return np.round(vector / scale).astype(np.int8).tobytes(), scale
+    
+    scale = max((abs(x) for x in embedding), default=0.0) / 127.0 or 1.0
+    return array("b", (round(x / scale) for x in embedding)).tobytes(), scale
+
+
+def dequantize_int8(data: bytes, scale: float) -> List[float]:
+    """
+    Restore a float embedding from quantize_int8 output.
+    
+    Args:
+        data (bytes): Packed int8 values.
+        scale (float): Per-vector scale.
+        
+    Returns:
+        List[float]: The approximate embedding vector.
+    """
+    if np is not None:
+        return (np.frombuffer(data, dtype=np.int8).astype(np.float32) * scale).tolist()
+    return [x * scale for x in array("b", data)]
+
+
+class EmbeddingCache:
+    """
+    A persistent SQLite cache of embeddings.
+    
+    Embeddings are keyed by a SHA-256 of the model name, input type and text,
+    and stored as raw float32 bytes, so embedding the same text again skips
+    the Voyage API. With quantize=True they are stored as int8 with a
+    per-vector scale instead, a quarter of the size at a small accuracy cost.
+    """
+    
+    # SQLite limits the number of bound parameters per statement
+    _MAX_PARAMS = 500
+    
+    def __init__(self, path: str, quantize: bool = False):
+        """
+        Initialize the EmbeddingCache.
+        
+        Args:
+            path (str): Path of the SQLite database file.
+            quantize (bool): Store embeddings as int8 instead of float32. The
+                two formats live in separate tables of the same file.
+        """
+        self.path = path
+        self.quantize = quantize
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if quantize:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_int8 (key TEXT PRIMARY KEY, embedding BLOB, scale REAL)"
+            )
+        else:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, embedding BLOB)")
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, input_type: str, text_content: str) -> str:
+        """
+        Build the cache key for a text embedded with a model.
+        
+        Args:
+            model (str): Embedding model name.
+            input_type (str): Type of input - "document" or "query".
+            text_content (str): The embedded text.
+            
+        Returns:
+            str: Hex digest identifying the embedding.
+        """
+        return hashlib.sha256(f"{model}|{input_type}|{text_content}".encode("utf-8")).hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached embeddings.
+        
+        Args:
+            keys (List[str]): Cache keys to look up.
+            
+        Returns:
+            Dict[str, List[float]]: Embeddings found, by key.
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._MAX_PARAMS):
+                chunk = keys[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                if self.quantize:
+                    rows = self._conn.execute(
+                        f"SELECT key, embedding, scale FROM cache_int8 WHERE key IN ({placeholders})", chunk
+                    )
+                    for key, blob, scale in rows:
+                        found[key] = dequantize_int8(blob, scale)
+                    continue
+                
+                rows = self._conn.execute(
+                    f"SELECT key, embedding FROM cache WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+        return found
+    
+    def set_many(self, embeddings: Dict[str, List[float]]) -> None:
+        """
+        Store embeddings in the cache.
+        
+        Args:
+            embeddings (Dict[str, List[float]]): Embeddings to store, by key.
+        """
+        with self._lock:
+            if self.quantize:
+                rows = [(key, *quantize_int8(embedding)) for key, embedding in embeddings.items()]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_int8 (key, embedding, scale) VALUES (?, ?, ?)", rows
+                )
+            else:
+                rows = [(key, array("f", embedding).tobytes()) for key, embedding in embeddings.items()]
+                self._conn.executemany("INSERT OR REPLACE INTO cache (key, embedding) VALUES (?, ?)", rows)
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+
 
 class VoyageEmbedder:
     """
@@ -19,34 +223,104 @@ class VoyageEmbedder:
     with error handling and retry logic.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "voyage-code-2"):
+    # Local file caching embeddings between runs
+    EMBEDDING_CACHE_FILE = ".embedding_cache.sqlite3"
+    
+    # Embedding dimension of each supported model; unknown models assume the default
+    _MODEL_DIMENSIONS = {
+        "voyage-code-2": 1536,
+        "voyage-2": 1024,
+        "voyage-large-2": 1536,
+        "voyage-law-2": 1024,
+        "voyage-multilingual-2": 1024
+    }
+    DEFAULT_DIMENSION = 1024
+    
+    # Characters of text sent to Voyage per input, kept safely inside each
+    # model's context window; longer texts are trimmed client-side before
+    # upload. MongoDBMemory truncates documents to the same budget.
+    DEFAULT_MAX_TEXT_CHARS = 32000
+    _MODEL_MAX_TEXT_CHARS = {
+        "voyage-2": 12000
+    }
+    
+    # Recent get_embedding results kept in process, per embedder
+    MEMORY_CACHE_SIZE = 4096
+    
+    # Maximum number of texts sent to Voyage in one embedding request
+    BATCH_SIZE = 128
+    
+    # Rate-limited requests back off with decorrelated jitter between these
+    # bounds (seconds), unless the server sends Retry-After
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 20.0
+    
+    # aget_embedding calls arriving within this many seconds of each other
+    # are sent to Voyage together
+    COALESCE_WINDOW = 0.005
+    
+    # Approximate token budget per embedding request, under Voyage's limit;
+    # tokens are estimated as characters / 4
+    MAX_TOKENS_PER_REQUEST = 100000
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "voyage-code-2",
+        cache_path: Optional[str] = EMBEDDING_CACHE_FILE,
+        quantize_cache: bool = False
+    ):
         """
         Initialize the VoyageEmbedder.
         
         Args:
             api_key (Optional[str]): Voyage AI API key. If None, will get from environment.
             model (str): Model name to use for embeddings. Defaults to "voyage-code-2".
+            cache_path (Optional[str]): SQLite file caching embeddings across runs.
+                None disables the cache.
+            quantize_cache (bool): Store cached embeddings as int8, cutting the
+                cache file to about a quarter of its size. Cache hits then return
+                slightly approximate vectors.
             
         Raises:
             ValueError: If API key is not provided and not found in environment.
         """
-        # Load environment variables
-        load_dotenv()
-        
         # Get API key
         self.api_key = api_key or os.getenv("VOYAGE_API_KEY")
         if not self.api_key:
             raise ValueError("VOYAGE_API_KEY not found in environment variables and not provided")
         
         # Initialize client and model
-        self.client = voyageai.Client(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
+        self._async_client = None
         self.model = model
+        self._dimension = self._MODEL_DIMENSIONS.get(model, self.DEFAULT_DIMENSION)
+        self.max_text_chars = self._MODEL_MAX_TEXT_CHARS.get(model, self.DEFAULT_MAX_TEXT_CHARS)
+        
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = EmbeddingCache(cache_path, quantize=quantize_cache)
+            except sqlite3.Error as e:
+                logger.warning("Could not open embedding cache: %s", e)
+        
+        # (text, input_type) -> embedding tuple, least recently used first
+        self._recent = OrderedDict()
+        self._recent_lock = threading.Lock()
+        
+        # (text, input_type, future) waiting for the aget_embedding batcher,
+        # which runs on the event loop that first used it
+        self._queue = None
+        self._batcher_task = None
+        # In-flight batch requests, referenced here so they are not
+        # garbage-collected before completing their futures
+        self._batch_tasks = set()
         
-        print(f"VoyageEmbedder initialized with model: {self.model}")
+        logger.debug("VoyageEmbedder initialized with model: %s", self.model)
     
     def get_embedding(self, text: str, input_type: str = "document") -> List[float]:
         """
-        Get embedding for a single text.
+        Get embedding for a single text, from the caches when available.
         
         Args:
             text (str): Text to embed.
@@ -55,41 +329,406 @@ class VoyageEmbedder:
         Returns:
             List[float]: The embedding vector.
             
+        Raises:
+            Exception: If API call fails after retries.
+        """
+        embedding = self._get_recent(text, input_type)
+        if embedding is None:
+            embedding = self._put_recent(text, input_type, self.get_embeddings([text], input_type)[0])
+        return list(embedding)
+    
+    async def aget_embedding(self, text: str, input_type: str = "document") -> List[float]:
+        """
+        Get embedding for a single text without blocking the event loop.
+        
+        Concurrent calls are coalesced: texts queued within COALESCE_WINDOW of
+        each other (up to BATCH_SIZE) go to Voyage in a single request.
+        
+        Args:
+            text (str): Text to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            List[float]: The embedding vector.
+            
+        Raises:
+            Exception: If API call fails after retries.
+        """
+        embedding = self._get_recent(text, input_type)
+        if embedding is not None:
+            return list(embedding)
+        
+        loop = asyncio.get_running_loop()
+        if self._batcher_task is None or self._batcher_task.done() or self._batcher_task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._batcher_task = loop.create_task(self._batcher(self._queue))
+        
+        future = loop.create_future()
+        await self._queue.put((text, input_type, future))
+        return list(self._put_recent(text, input_type, await future))
+    
+    async def _batcher(self, queue: "asyncio.Queue") -> None:
+        """
+        Drain queued aget_embedding calls into batched embedding requests.
+        
+        Args:
+            queue (asyncio.Queue): Queue of (text, input_type, future) items.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await queue.get()]
+            deadline = loop.time() + self.COALESCE_WINDOW
+            try:
+                while len(items) < self.BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                for _, _, future in items:
+                    future.cancel()
+                raise
+            
+            groups = {}
+            for item in items:
+                groups.setdefault(item[1], []).append(item)
+            # Resolve in the background so the next batch can start filling
+            for input_type, group in groups.items():
+                task = loop.create_task(self._resolve_batch(group, input_type))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _resolve_batch(self, group: List[Tuple], input_type: str) -> None:
+        """
+        Embed one coalesced batch and complete its callers' futures.
+        
+        Args:
+            group (List[Tuple]): Queued (text, input_type, future) items.
+            input_type (str): Type of input shared by the group.
+        """
+        try:
+            embeddings = await self.aget_embeddings([text for text, _, _ in group], input_type)
+        except asyncio.CancelledError:
+            for _, _, future in group:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), embedding in zip(group, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+    
+    def _get_recent(self, text: str, input_type: str) -> Optional[Tuple[float, ...]]:
+        """
+        Look up an embedding in the in-process LRU.
+        
+        Args:
+            text (str): Embedded text.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            Optional[Tuple[float, ...]]: The embedding, or None if not cached.
+        """
+        recent_key = (text, input_type)
+        with self._recent_lock:
+            embedding = self._recent.get(recent_key)
+            if embedding is not None:
+                self._recent.move_to_end(recent_key)
+            return embedding
+    
+    def _put_recent(self, text: str, input_type: str, embedding: List[float]) -> Tuple[float, ...]:
+        """
+        Store an embedding in the in-process LRU.
+        
+        Args:
+            text (str): Embedded text.
+            input_type (str): Type of input - "document" or "query".
+            embedding (List[float]): The embedding vector.
+            
+        Returns:
+            Tuple[float, ...]: The stored, immutable embedding.
+        """
+        embedding = tuple(embedding)
+        with self._recent_lock:
+            self._recent[(text, input_type)] = embedding
+            if len(self._recent) > self.MEMORY_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return embedding
+    
+    def get_embedding_np(self, text: str, input_type: str = "document") -> "np.ndarray":
+        """
+        Get embedding for a single text as a float32 array.
+        
+        Args:
+            text (str): Text to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            np.ndarray: The embedding vector, shape (dim,).
+            
+        Raises:
+            ImportError: If numpy is not installed.
+            Exception: If API call fails after retries.
+        """
+        if np is None:
+            raise ImportError("numpy is required for get_embedding_np")
+        return np.asarray(self.get_embedding(text, input_type), dtype=np.float32)
+    
+    def get_embeddings(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        """
+        Get embeddings for multiple texts in a batch.
+        
+        Only texts missing from the cache are sent to the API, in requests
+        packed by _plan_batches, and their embeddings are spliced back in
+        input order.
+        
+        Args:
+            texts (List[str]): List of texts to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            List[List[float]]: List of embedding vectors.
+            
+        Raises:
+            Exception: If API call fails after retries.
+        """
+        if not texts:
+            return []
+        
+        keys, embeddings, uncached = self._split_cached(texts, input_type)
+        if uncached:
+            pending = self._fit_to_context(list(uncached.values()))
+            fresh = [None] * len(pending)
+            for batch in self._plan_batches(pending, self.BATCH_SIZE):
+                batch_embeddings = self._embed_batch([pending[i] for i in batch], input_type)
+                for i, embedding in zip(batch, batch_embeddings):
+                    fresh[i] = embedding
+            self._store_fresh(uncached, fresh, embeddings)
+        
+        return [embeddings[key] for key in keys]
+    
+    def get_embeddings_np(self, texts: List[str], input_type: str = "document") -> "np.ndarray":
+        """
+        Get embeddings for multiple texts as one float32 matrix.
+        
+        Args:
+            texts (List[str]): List of texts to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            np.ndarray: Embeddings of shape (len(texts), dim), in input order.
+            
+        Raises:
+            ImportError: If numpy is not installed.
+            Exception: If API call fails after retries.
+        """
+        if np is None:
+            raise ImportError("numpy is required for get_embeddings_np")
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+        return np.asarray(self.get_embeddings(texts, input_type), dtype=np.float32)
+    
+    async def aget_embeddings(
+        self,
+        texts: List[str],
+        input_type: str = "document",
+        batch_size: int = BATCH_SIZE,
+        max_concurrency: int = 8
+    ) -> List[List[float]]:
+        """
+        Get embeddings for multiple texts, sending sub-batches concurrently.
+        
+        Args:
+            texts (List[str]): List of texts to embed.
+            input_type (str): Type of input - "document" or "query".
+            batch_size (int): Maximum number of texts per API request; requests
+                are also capped at MAX_TOKENS_PER_REQUEST.
+            max_concurrency (int): Maximum number of requests in flight at once.
+            
+        Returns:
+            List[List[float]]: List of embedding vectors, in input order.
+            
+        Raises:
+            Exception: If API call fails after retries.
+        """
+        if not texts:
+            return []
+        
+        keys, embeddings, uncached = self._split_cached(texts, input_type)
+        if uncached:
+            pending = self._fit_to_context(list(uncached.values()))
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def embed_chunk(batch: List[int]) -> List[List[float]]:
+                async with semaphore:
+                    return await self._aembed_batch([pending[i] for i in batch], input_type)
+            
+            batches = self._plan_batches(pending, batch_size)
+            chunks = await asyncio.gather(*(embed_chunk(batch) for batch in batches))
+            
+            fresh = [None] * len(pending)
+            for batch, batch_embeddings in zip(batches, chunks):
+                for i, embedding in zip(batch, batch_embeddings):
+                    fresh[i] = embedding
+            self._store_fresh(uncached, fresh, embeddings)
+        
+        return [embeddings[key] for key in keys]
+    
+    def _fit_to_context(self, texts: List[str]) -> List[str]:
+        """
+        Trim texts longer than the model's context window before upload.
+        
+        Voyage truncates over-long inputs server-side anyway, so the trimmed
+        tail only cost upload bandwidth and inflated the request token budget.
+        
+        Args:
+            texts (List[str]): Texts to embed.
+            
+        Returns:
+            List[str]: The texts, each at most max_text_chars long.
+        """
+        limit = self.max_text_chars
+        trimmed = 0
+        fitted = []
+        for text in texts:
+            if len(text) > limit:
+                text = text[:limit]
+                trimmed += 1
+            fitted.append(text)
+        if trimmed:
+            logger.debug("Trimmed %d texts to the %s context window", trimmed, self.model)
+        return fitted
+    
+    def _plan_batches(self, texts: List[str], batch_size: int) -> List[List[int]]:
+        """
+        Group texts into API requests of similar length.
+        
+        Texts are sorted longest first and packed greedily, so each request
+        stays within batch_size texts and MAX_TOKENS_PER_REQUEST estimated
+        tokens, and short texts are not held up behind very long ones.
+        
+        Args:
+            texts (List[str]): Texts to embed.
+            batch_size (int): Maximum number of texts per request.
+            
+        Returns:
+            List[List[int]]: Indexes into texts, one list per request.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for i in order:
+            tokens = len(texts[i]) // 4 + 1
+            if batch and (len(batch) >= batch_size or batch_tokens + tokens > self.MAX_TOKENS_PER_REQUEST):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(i)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _split_cached(
+        self, texts: List[str], input_type: str
+    ) -> Tuple[List, Dict, Dict]:
+        """
+        Split texts into embeddings found in the cache and texts still to embed.
+        
+        Repeated texts share a key, so each distinct text is embedded once per
+        call whether or not the cache is enabled.
+        
+        Args:
+            texts (List[str]): List of texts to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            Tuple[List, Dict, Dict]: One key per text, the cached embeddings by
+            key, and the texts to embed by key.
+        """
+        if self.cache is None:
+            return texts, {}, dict(zip(texts, texts))
+        
+        keys = [EmbeddingCache.make_key(self.model, input_type, text) for text in texts]
+        embeddings = self.cache.get_many(list(set(keys)))
+        
+        uncached = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        return keys, embeddings, uncached
+    
+    def _store_fresh(
+        self, uncached: Dict, fresh: List[List[float]], embeddings: Dict
+    ) -> None:
+        """
+        Record freshly embedded texts in the cache and the call's results.
+        
+        Args:
+            uncached (Dict): Texts that were embedded, by key.
+            fresh (List[List[float]]): Their embeddings, in the same order.
+            embeddings (Dict): Embeddings for the call, by key, updated in place.
+        """
+        fresh = dict(zip(uncached.keys(), fresh))
+        if self.cache is not None:
+            self.cache.set_many(fresh)
+        embeddings.update(fresh)
+    
+    def _embed_batch(self, texts: List[str], input_type: str) -> List[List[float]]:
+        """
+        Embed texts with one API request, retrying on rate limits.
+        
+        Args:
+            texts (List[str]): List of texts to embed.
+            input_type (str): Type of input - "document" or "query".
+            
+        Returns:
+            List[List[float]]: List of embedding vectors.
+            
         Raises:
             Exception: If API call fails after retries.
         """
         max_retries = 3
-        retry_delay = 1.0
+        retry_delay = self.RETRY_BASE_DELAY
         
         for attempt in range(max_retries):
             try:
                 result = self.client.embed(
-                    texts=[text], 
+                    texts=texts, 
                     model=self.model, 
                     input_type=input_type
                 )
-                return result.embeddings[0]
+                return result.embeddings
                 
-            except voyageai.RateLimitError as e:
+            except voyageai.error.RateLimitError as e:
                 if attempt < max_retries - 1:
-                    print(f"Rate limit hit, retrying in {retry_delay} seconds... (attempt {attempt + 1}/{max_retries})")
+                    retry_delay = self._backoff_delay(e, retry_delay)
+                    logger.warning(
+                        "Rate limit hit, retrying in %.2f seconds... (attempt %d/%d)",
+                        retry_delay, attempt + 1, max_retries
+                    )
                     time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
                 else:
-                    print(f"Rate limit error after {max_retries} attempts: {str(e)}")
+                    logger.error("Rate limit error after %d attempts: %s", max_retries, e)
                     raise
                     
-            except voyageai.APIError as e:
-                print(f"Voyage AI API error: {str(e)}")
+            except voyageai.error.APIError as e:
+                logger.error("Voyage AI API error: %s", e)
                 raise
                 
             except Exception as e:
-                print(f"Unexpected error getting embedding: {str(e)}")
+                logger.error("Unexpected error getting embeddings: %s", e)
                 raise
     
-    def get_embeddings(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+    async def _aembed_batch(self, texts: List[str], input_type: str) -> List[List[float]]:
         """
-        Get embeddings for multiple texts in a batch.
+        Embed texts with one async API request, retrying on rate limits.
         
         Args:
             texts (List[str]): List of texts to embed.
@@ -101,61 +740,109 @@ class VoyageEmbedder:
         Raises:
             Exception: If API call fails after retries.
         """
-        if not texts:
-            return []
+        if self._async_client is None:
+            self._async_client = _get_async_client(self.api_key)
         
         max_retries = 3
-        retry_delay = 1.0
+        retry_delay = self.RETRY_BASE_DELAY
         
         for attempt in range(max_retries):
             try:
-                result = self.client.embed(
+                result = await self._async_client.embed(
                     texts=texts, 
                     model=self.model, 
                     input_type=input_type
                 )
                 return result.embeddings
                 
-            except voyageai.RateLimitError as e:
+            except voyageai.error.RateLimitError as e:
                 if attempt < max_retries - 1:
-                    print(f"Rate limit hit, retrying in {retry_delay} seconds... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
+                    retry_delay = self._backoff_delay(e, retry_delay)
+                    logger.warning(
+                        "Rate limit hit, retrying in %.2f seconds... (attempt %d/%d)",
+                        retry_delay, attempt + 1, max_retries
+                    )
+                    await asyncio.sleep(retry_delay)
                 else:
-                    print(f"Rate limit error after {max_retries} attempts: {str(e)}")
+                    logger.error("Rate limit error after %d attempts: %s", max_retries, e)
                     raise
                     
-            except voyageai.APIError as e:
-                print(f"Voyage AI API error: {str(e)}")
+            except voyageai.error.APIError as e:
+                logger.error("Voyage AI API error: %s", e)
                 raise
                 
             except Exception as e:
-                print(f"Unexpected error getting embeddings: {str(e)}")
+                logger.error("Unexpected error getting embeddings: %s", e)
                 raise
     
+    def _backoff_delay(self, error: Exception, previous: float) -> float:
+        """
+        Pick how long to wait before retrying a rate-limited request.
+        
+        Uses the server's Retry-After header when present, otherwise
+        decorrelated jitter, so concurrent callers do not retry in lockstep.
+        
+        Args:
+            error (Exception): The rate limit error.
+            previous (float): The previous delay, in seconds.
+            
+        Returns:
+            float: Seconds to wait.
+        """
+        headers = getattr(error, "headers", None)
+        if not headers and getattr(error, "response", None) is not None:
+            headers = getattr(error.response, "headers", None)
+        if headers:
+            try:
+                return min(self.RETRY_MAX_DELAY, float(headers.get("Retry-After")))
+            except (TypeError, ValueError):
+                pass
+        return min(self.RETRY_MAX_DELAY, random.uniform(self.RETRY_BASE_DELAY, previous * 3))
+    
     def get_embedding_dimension(self) -> int:
         """
         Get the dimension of embeddings for the current model.
         
         Returns:
-            int: Embedding dimension (1024 for voyage-code-2).
+            int: Embedding dimension (1536 for voyage-code-2).
+        """
+        return self._dimension
+    
+    def close(self) -> None:
+        """Close the embedding cache."""
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def aclose(self) -> None:
         """
-        # Model dimension mapping
-        model_dimensions = {
-            "voyage-code-2": 1024,
-            "voyage-2": 1024,
-            "voyage-large-2": 1536,
-            "voyage-law-2": 1024,
-            "voyage-multilingual-2": 1024
-        }
+        Stop the aget_embedding batcher running on the current event loop.
         
-        return model_dimensions.get(self.model, 1024)  # Default to 1024
+        Calls still queued or in flight are cancelled, so their callers get
+        CancelledError instead of waiting forever.
+        """
+        tasks = list(self._batch_tasks)
+        if self._batcher_task is not None and not self._batcher_task.done():
+            tasks.append(self._batcher_task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, _, future = self._queue.get_nowait()
+                future.cancel()
+        
+        self._batcher_task = None
+        self._queue = None
 
 
 if __name__ == "__main__":
     """
     Example usage and testing of the VoyageEmbedder.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     try:
         # Initialize embedder
         embedder = VoyageEmbedder()